@@ -103,11 +103,10 @@ async def availability(
         barakati_sheet_dates = get_barakati_all_sheet_start_dates("Barakati")
         all_sheet_start_dates.update(barakati_sheet_dates)
     
-    # For Lamain Voyages I, also add all sheet start dates (including available ones)
+    # For Lamain Voyages I, also add all sheet start dates (including available ones),
+    # kept by the parser run above instead of parsing the sheet a second time
     if boat == "LaMain Voyages I":
-        from .sheets.open_trip_parser import parse_open_trip_from_sheets
-        _, lamain_sheet_dates = parse_open_trip_from_sheets("LaMain Voyages I")
-        all_sheet_start_dates.update(lamain_sheet_dates)
+        all_sheet_start_dates.update(get_lamain_sheet_start_dates())
     
     results: List[AvailabilityResult] = []
     for room in rooms:
@@ -17,19 +17,14 @@ def _parse_calendar_date(day_str: str, month: int, year: int = 2025) -> date:
     except (ValueError, TypeError):
         return None
 
-def _is_available_color(color: dict) -> bool:
-    """Check if a color indicates availability (cyan)"""
-    if not color:
-        return False  # No color means not available
-    
-    r = color.get('r', 0)  # Default to 0 if missing
-    g = color.get('g', 0)  # Default to 0 if missing
-    b = color.get('b', 0)  # Default to 0 if missing
-    
-    # Cyan color means available (r=0, g=1, b=1)
-    return r == 0 and g == 1 and b == 1
+# Packed cyan (r=0, g=1, b=1)
+CYAN = 0x00FFFF
 
-def _parse_arfisyana_calendar(rows: List[List[str]], colors: List[List[dict]], boat_name: str) -> List[Dict]:
+def _is_available_color(color: int) -> bool:
+    """Check if a packed color indicates availability (cyan)"""
+    return color == CYAN
+
+def _parse_arfisyana_calendar(rows: List[List[str]], colors: List[List[int]], boat_name: str) -> List[Dict]:
     """Parse the ARFISYANA INDAH calendar layout using proper month section detection"""
     results = []
     available_dates = []
@@ -116,8 +111,13 @@ def _parse_arfisyana_calendar(rows: List[List[str]], colors: List[List[dict]], b
     
     return results
 
-def parse_arfisyana_from_sheets(boat_name: str, worksheet_title: str = "ARFISYANA INDAH") -> List[Dict]:
-    """Parse ARFISYANA INDAH data directly from Google Sheets"""
+def parse_arfisyana_from_sheets(boat_name: str, worksheet_title: str = "ARFISYANA INDAH",
+                                prefetched: Tuple[List[List[str]], list] | None = None) -> List[Dict]:
+    """Parse ARFISYANA INDAH data directly from Google Sheets, or its prefetched (rows, colors)"""
+    if prefetched is not None:
+        rows, colors = prefetched
+        return _parse_arfisyana_calendar(rows, colors, boat_name)
+
     from ..config import BOAT_CATALOG
     
     if boat_name not in BOAT_CATALOG:
@@ -9,13 +9,11 @@ import requests
 from openpyxl import load_workbook
 
 from .client import get_gspread_client, get_sheets_service
-from .color_dump import get_worksheet_colors
+from .color_dump import WHITE, get_worksheet_colors
 
 
-def _is_white(color: dict) -> bool:
-    if not color:
-        return False
-    return color.get("r", 0) == 1 and color.get("g", 0) == 1 and color.get("b", 0) == 1
+def _is_white(color: int) -> bool:
+    return color == WHITE
 
 
 def _is_white_excel(fill) -> bool:
@@ -0,0 +1,72 @@
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Callable
+
+from .client import get_drive_service
+
+logger = logging.getLogger(__name__)
+
+# Fetched sheet payloads, one pickle per (spreadsheet, namespace, name), stamped with the file's modifiedTime.
+# Each parser uses its own namespace directory ("kanha", "sip1"), since payload shapes differ per parser.
+_CACHE_DIR = os.path.join("data", "cache")
+
+# Characters not allowed in file names on any platform we run on (":" opens an NTFS stream)
+_UNSAFE_NAME_CHARS = str.maketrans({c: "_" for c in '/\\:*?"<>|'})
+
+# Part of every stamp: bump when a cached payload's shape changes, so pickles from an older
+# deploy are refetched instead of served until the spreadsheet is next edited
+_FORMAT_VERSION = 1
+
+
+def _cache_disabled() -> bool:
+    return os.getenv("SHEETS_CACHE_DISABLE", "").strip().lower() in ("1", "true", "yes")
+
+
+def get_modified_time(spreadsheet_id: str) -> str | None:
+    """Drive modifiedTime of the spreadsheet, or None when it can't be read"""
+    if _cache_disabled():
+        return None
+    try:
+        meta = get_drive_service().files().get(
+            fileId=spreadsheet_id,
+            fields="modifiedTime",
+            supportsAllDrives=True,
+        ).execute()
+        return meta.get("modifiedTime")
+    except Exception as e:
+        logger.warning("Could not read modifiedTime for %s: %s", spreadsheet_id, e)
+        return None
+
+
+def cached_fetch(spreadsheet_id: str, namespace: str, name: str, modified_time: str | None,
+                 fetch: Callable[[], Any]) -> Any:
+    """Return fetch()'s payload, reusing the on-disk copy while the spreadsheet is unmodified.
+
+    Without a modified_time (lookup failed or SHEETS_CACHE_DISABLE set) this always calls fetch().
+    """
+    if modified_time is None:
+        return fetch()
+
+    path = os.path.join(_CACHE_DIR, spreadsheet_id, namespace, f"{name.translate(_UNSAFE_NAME_CHARS)}.pkl")
+    expected = (_FORMAT_VERSION, modified_time)
+    try:
+        with open(path, "rb") as f:
+            stamp, payload = pickle.load(f)
+        if stamp == expected:
+            return payload
+    except (OSError, EOFError, ValueError, pickle.PickleError):
+        pass
+
+    payload = fetch()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp name: parsers run concurrently and may refresh the same entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((expected, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write sheet cache %s: %s", path, e)
+    return payload
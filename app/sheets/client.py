@@ -1,23 +1,44 @@
 import os
+import threading
+from functools import lru_cache
+
 import gspread
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets.readonly",
+    # modifiedTime lookups for the on-disk sheet cache
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
 ]
 
+# Clients are reused per thread: the discovery services sit on httplib2, which is not thread-safe,
+# while the parser pool threads are long-lived, so each keeps its own authorized connections.
+_local = threading.local()
+
 
+@lru_cache(maxsize=1)
 def _credentials():
     creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "api_key.json")
     return Credentials.from_service_account_file(creds_path, scopes=SCOPES)
 
 
 def get_gspread_client():
-    credentials = _credentials()
-    return gspread.authorize(credentials)
+    client = getattr(_local, "gspread_client", None)
+    if client is None:
+        client = _local.gspread_client = gspread.authorize(_credentials())
+    return client
 
 
 def get_sheets_service():
-    credentials = _credentials()
-    return build("sheets", "v4", credentials=credentials)
+    service = getattr(_local, "sheets_service", None)
+    if service is None:
+        service = _local.sheets_service = build("sheets", "v4", credentials=_credentials())
+    return service
+
+
+def get_drive_service():
+    service = getattr(_local, "drive_service", None)
+    if service is None:
+        service = _local.drive_service = build("drive", "v3", credentials=_credentials())
+    return service
@@ -1,130 +1,321 @@
 import os
 import json
-from typing import Dict, Any
+import threading
+from array import array
+from typing import Dict, Any, List, Tuple
+
+from gspread.utils import absolute_range_name, fill_gaps
 
 from .client import get_gspread_client, get_sheets_service
 from .sampler import extract_spreadsheet_id
 
+# Destination directories already created during this process
+_MKDIR_CACHE: set[str] = set()
+
+# Packed 0xRRGGBB value of a white cell; missing channels pack as 0 like the old dict default
+WHITE = 0xFFFFFF
+
+# Bound concurrent Sheets API calls so parallel worksheet fetches stay within quota
+_API_SEMAPHORE = threading.Semaphore(5)
+
+
+# Packed values for the channel tuples that dominate schedule sheets (unset, black, white)
+_COMMON: Dict[Tuple, int] = {
+    (None, None, None): 0,
+    (0, 0, 0): 0,
+    (1, 1, 1): WHITE,
+}
+
+
+# Other channel tuples seen so far; sheets use a small palette, so each distinct color packs once
+_PACKED_CACHE: Dict[Tuple, int] = {}
+_PACKED_CACHE_MAX = 4096
+
+
+def pack_rgb(bg: Dict[str, float]) -> int:
+    """Pack a Sheets backgroundColor dict into a single 0xRRGGBB int"""
+    key = (bg.get("red"), bg.get("green"), bg.get("blue"))
+    packed = _COMMON.get(key)
+    if packed is not None:
+        return packed
+    packed = _PACKED_CACHE.get(key)
+    if packed is None:
+        packed = (
+            (round((key[0] or 0) * 255) << 16)
+            | (round((key[1] or 0) * 255) << 8)
+            | round((key[2] or 0) * 255)
+        )
+        if len(_PACKED_CACHE) < _PACKED_CACHE_MAX:
+            _PACKED_CACHE[key] = packed
+    return packed
+
+
+def colors_from_json(data: list) -> List[array]:
+    """Convert a colors dump (packed ints, or legacy {"r","g","b"} dicts) to packed rows"""
+    out = []
+    for row in data:
+        packed = array("I")
+        for c in row:
+            if isinstance(c, int):
+                packed.append(c)
+            elif c is None or all(c.get(k) is None for k in ("r", "g", "b")):
+                # Legacy dumps store unset backgrounds as all-None channels (white)
+                packed.append(WHITE)
+            else:
+                packed.append(pack_rgb({"red": c.get("r") or 0, "green": c.get("g") or 0, "blue": c.get("b") or 0}))
+        out.append(packed)
+    return out
+
+
+def _col_letter(col: int) -> str:
+    """1-based column number to A1 letters (1 -> A, 27 -> AA)"""
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def worksheet_range(worksheet_title: str, row_count: int, col_count: int) -> str:
+    """A1 range covering the worksheet's actual grid instead of a fixed A1:ZZ999 box"""
+    return absolute_range_name(worksheet_title, f"A1:{_col_letter(max(col_count, 1))}{max(row_count, 1)}")
 
-def dump_worksheet_colors(sheet_link: str, worksheet_title: str, boat_name: str) -> str:
-    service = get_sheets_service()
-    spreadsheet_id = extract_spreadsheet_id(sheet_link)
 
-    # Find the sheetId for the given title
-    meta = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    target_sheet_id = None
+def _grid_range(service, spreadsheet_id: str, worksheet_title: str) -> str:
+    """Look up the worksheet's gridProperties and return its bounded A1 range"""
+    meta = service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields="sheets.properties(title,gridProperties)",
+    ).execute()
     for s in meta.get("sheets", []):
         props = s.get("properties", {})
         if props.get("title") == worksheet_title:
-            target_sheet_id = props.get("sheetId")
-            break
-    if target_sheet_id is None:
-        raise ValueError("Worksheet not found")
+            grid_props = props.get("gridProperties", {}) or {}
+            return worksheet_range(worksheet_title, grid_props.get("rowCount", 1000), grid_props.get("columnCount", 26))
+    raise ValueError("Worksheet not found")
+
+
+def _iter_row_data(sheet_data: dict):
+    """Yield rowData entries in order, releasing each from the decoded response once consumed.
 
-    rng = f"{worksheet_title}!A1:ZZ999"
+    Keeps peak memory near a single copy of the grid instead of raw response + converted output.
+    """
+    for block in sheet_data.get("data", []) or []:
+        row_data = block.pop("rowData", None) or []
+        row_data.reverse()
+        while row_data:
+            yield row_data.pop()
+
+
+def dump_worksheet_colors(sheet_link: str, worksheet_title: str, boat_name: str) -> str:
+    service = get_sheets_service()
+    spreadsheet_id = extract_spreadsheet_id(sheet_link)
+
+    rng = _grid_range(service, spreadsheet_id, worksheet_title)
+    # Only the background colors, not every cell's full format
     grid = service.spreadsheets().get(
         spreadsheetId=spreadsheet_id,
         ranges=[rng],
-        includeGridData=True
+        includeGridData=True,
+        fields="sheets.data.rowData.values.effectiveFormat.backgroundColor",
     ).execute()
 
-    grid_data = grid["sheets"][0].get("data", [])
     colors = []
-    for block in grid_data:
-        for row in block.get("rowData", []) or []:
-            row_colors = []
-            for cell in row.get("values", []) or []:
-                bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
-                row_colors.append({
-                    "r": bg.get("red", 0),  # Default to 0 if missing
-                    "g": bg.get("green", 0),  # Default to 0 if missing
-                    "b": bg.get("blue", 0),  # Default to 0 if missing
-                })
-            colors.append(row_colors)
+    for row in _iter_row_data(grid["sheets"][0]):
+        row_colors = array("I")
+        for cell in row.get("values", []) or []:
+            bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
+            row_colors.append(pack_rgb(bg))
+        colors.append(row_colors)
 
     dest_root = os.path.join("data", "colors", boat_name)
-    os.makedirs(dest_root, exist_ok=True)
+    if dest_root not in _MKDIR_CACHE:
+        os.makedirs(dest_root, exist_ok=True)
+        _MKDIR_CACHE.add(dest_root)
     dest_path = os.path.join(dest_root, f"{worksheet_title}.json")
-    with open(dest_path, "w", encoding="utf-8") as f:
-        json.dump(colors, f)
+    # Encode once and write in a single call instead of streaming many small chunks
+    payload = json.dumps([row.tolist() for row in colors], separators=(",", ":")).encode("utf-8")
+    with open(dest_path, "wb") as f:
+        f.write(payload)
     return dest_path
 
 
-def get_worksheet_colors(service, spreadsheet_id: str, worksheet_title: str) -> list:
-    """Get worksheet colors directly without saving to file"""
-    # Find the sheetId for the given title
-    meta = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    target_sheet_id = None
-    for s in meta.get("sheets", []):
-        props = s.get("properties", {})
-        if props.get("title") == worksheet_title:
-            target_sheet_id = props.get("sheetId")
-            break
-    if target_sheet_id is None:
-        raise ValueError("Worksheet not found")
+def get_worksheet_colors(service, spreadsheet_id: str, worksheet_title: str, rng: str | None = None) -> list:
+    """Get worksheet colors directly without saving to file.
 
-    rng = f"{worksheet_title}!A1:ZZ999"
+    Returns one array('I') per row holding packed 0xRRGGBB ints (see pack_rgb).
+    Pass `rng` to skip the gridProperties lookup when the caller only needs part of the sheet.
+    """
+    if rng is None:
+        rng = _grid_range(service, spreadsheet_id, worksheet_title)
+    # Only the background colors: the full grid payload is mostly values and other formats
     grid = service.spreadsheets().get(
         spreadsheetId=spreadsheet_id,
         ranges=[rng],
-        includeGridData=True
+        fields="sheets.data.rowData.values.effectiveFormat.backgroundColor",
     ).execute()
 
-    grid_data = grid["sheets"][0].get("data", [])
     colors = []
-    for block in grid_data:
-        for row in block.get("rowData", []) or []:
-            row_colors = []
-            for cell in row.get("values", []) or []:
-                bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
-                row_colors.append({
-                    "r": bg.get("red", 0),  # Default to 0 if missing
-                    "g": bg.get("green", 0),  # Default to 0 if missing
-                    "b": bg.get("blue", 0),  # Default to 0 if missing
-                })
-            colors.append(row_colors)
+    for row in _iter_row_data(grid["sheets"][0]):
+        row_colors = array("I")
+        for cell in row.get("values", []) or []:
+            bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
+            row_colors.append(pack_rgb(bg))
+        colors.append(row_colors)
 
     return colors
 
 
-def get_worksheet_borders(service, spreadsheet_id: str, worksheet_title: str) -> list:
-    """Get worksheet cell borders. Returns 2D array with border styles per side.
+def get_worksheet_formats(service, spreadsheet_id: str, worksheet_title: str, rng: str | None = None) -> Tuple[list, list]:
+    """Get worksheet colors and borders from one API call and one pass over the grid.
 
-    Each cell is a dict: {"left": style|None, "right": style|None, "top": style|None, "bottom": style|None}
-    Styles are Google enum strings like "SOLID", "SOLID_MEDIUM", "SOLID_THICK", "DASHED", "DOUBLE", etc.
+    Returns (colors, borders): colors shaped like get_worksheet_colors(), and per cell a dict
+    {"left", "right", "top", "bottom"} of Google border style strings ("SOLID", "SOLID_MEDIUM", ...) or None.
+    Pass `rng` (see worksheet_range) when the grid size is already known to skip the metadata probe.
     """
-    # Find the sheetId for the given title
-    meta = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    target_sheet_id = None
-    for s in meta.get("sheets", []):
-        props = s.get("properties", {})
-        if props.get("title") == worksheet_title:
-            target_sheet_id = props.get("sheetId")
-            break
-    if target_sheet_id is None:
-        raise ValueError("Worksheet not found")
-
-    rng = f"{worksheet_title}!A1:ZZ999"
+    if rng is None:
+        rng = _grid_range(service, spreadsheet_id, worksheet_title)
     grid = service.spreadsheets().get(
         spreadsheetId=spreadsheet_id,
         ranges=[rng],
-        includeGridData=True
+        includeGridData=True,
+        fields="sheets.data.rowData.values.effectiveFormat(backgroundColor,borders)",
     ).execute()
 
-    grid_data = grid["sheets"][0].get("data", [])
+    colors = []
     borders = []
-    for block in grid_data:
-        for row in block.get("rowData", []) or []:
-            row_borders = []
-            for cell in row.get("values", []) or []:
-                fmt = (cell.get("effectiveFormat", {}) or {})
-                br = (fmt.get("borders", {}) or {})
-                row_borders.append({
-                    "left": (br.get("left", {}) or {}).get("style"),
-                    "right": (br.get("right", {}) or {}).get("style"),
-                    "top": (br.get("top", {}) or {}).get("style"),
-                    "bottom": (br.get("bottom", {}) or {}).get("style"),
-                })
-            borders.append(row_borders)
-
-    return borders
\ No newline at end of file
+    for row in _iter_row_data(grid["sheets"][0]):
+        row_colors = array("I")
+        row_borders = []
+        for cell in row.get("values", []) or []:
+            fmt = cell.get("effectiveFormat") or {}
+            bg = fmt.get("backgroundColor") or {}
+            br = fmt.get("borders") or {}
+            row_colors.append(pack_rgb(bg))
+            row_borders.append({
+                "left": (br.get("left") or {}).get("style"),
+                "right": (br.get("right") or {}).get("style"),
+                "top": (br.get("top") or {}).get("style"),
+                "bottom": (br.get("bottom") or {}).get("style"),
+            })
+        colors.append(row_colors)
+        borders.append(row_borders)
+
+    return colors, borders
+
+
+def _row_values(row: dict) -> List[str | None]:
+    """Stripped formatted values of a rowData entry; empty cells are None, trailing ones trimmed"""
+    vals = [(cell.get("formattedValue") or "").strip() or None for cell in row.get("values", []) or []]
+    while vals and vals[-1] is None:
+        vals.pop()
+    return vals
+
+
+def fetch_grid_bundle(service, spreadsheet_id: str, worksheet_title: str, rng: str | None = None) -> Tuple[List[List[str | None]], list, List[Dict]]:
+    """Fetch values, background colors and merges of a worksheet in a single API call.
+
+    Returns (rows, colors, merges). Rows hold stripped strings with None for empty cells, so
+    callers can skip blanks without re-stripping; colors match get_worksheet_colors().
+    Pass `rng` (see worksheet_range) to bound the request to the worksheet's real grid.
+    """
+    if rng is None:
+        rng = _grid_range(service, spreadsheet_id, worksheet_title)
+    with _API_SEMAPHORE:
+        grid = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            ranges=[rng],
+            includeGridData=True,
+            fields="sheets(merges,data(rowData(values(formattedValue,effectiveFormat/backgroundColor))))",
+        ).execute()
+
+    sheets = grid.get("sheets", [])
+    if not sheets:
+        raise ValueError("Worksheet not found")
+    sheet_data = sheets[0]
+
+    rows: List[List[str | None]] = []
+    colors = []
+    for row in _iter_row_data(sheet_data):
+        rows.append(_row_values(row))
+        row_colors = array("I")
+        for cell in row.get("values", []) or []:
+            bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
+            row_colors.append(pack_rgb(bg))
+        colors.append(row_colors)
+    while rows and not rows[-1]:
+        rows.pop()
+
+    return rows, colors, sheet_data.get("merges", []) or []
+
+
+def _values_and_colors(sheet_data: dict) -> Tuple[List[List[str]], list]:
+    """formattedValue rows trimmed like a values get (trailing empty cells/rows dropped) and packed color rows"""
+    rows: List[List[str]] = []
+    colors = []
+    for row in _iter_row_data(sheet_data):
+        cells = row.get("values", []) or []
+        vals = [cell.get("formattedValue", "") for cell in cells]
+        while vals and not vals[-1]:
+            vals.pop()
+        rows.append(vals)
+        row_colors = array("I")
+        for cell in cells:
+            bg = (cell.get("effectiveFormat", {}) or {}).get("backgroundColor", {}) or {}
+            row_colors.append(pack_rgb(bg))
+        colors.append(row_colors)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows, colors
+
+
+def fetch_worksheet_grid(service, spreadsheet_id: str, rng: str) -> Tuple[List[List[str]], list]:
+    """Fetch formatted values and background colors of a range in a single spreadsheets.get.
+
+    Returns (rows, colors): rows are padded like get_all_values(), colors match get_worksheet_colors().
+    """
+    with _API_SEMAPHORE:
+        grid = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            ranges=[rng],
+            fields="sheets(data(rowData(values(formattedValue,effectiveFormat/backgroundColor))))",
+        ).execute()
+
+    sheets = grid.get("sheets", [])
+    if not sheets:
+        raise ValueError("Worksheet not found")
+
+    rows, colors = _values_and_colors(sheets[0])
+    return (fill_gaps(rows) if rows else rows), colors
+
+
+def fetch_values_and_colors(service, spreadsheet_id: str, worksheets: List[Tuple[str, str | None]]) -> Dict[str, Tuple[List[List[str]], list]]:
+    """Fetch values and background colors of several worksheets of one spreadsheet in one API call.
+
+    `worksheets` holds (title, a1_range or None). A None range reads the whole worksheet and pads
+    rows like get_all_values(); an explicit range (e.g. "A1:Z1000") matches ws.get(range), and its
+    colors cover the same range.
+    Returns {title: (rows, colors)} with colors shaped like get_worksheet_colors().
+    """
+    with _API_SEMAPHORE:
+        grid = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            # Quoted: titles may have trailing spaces or look like A1 references
+            ranges=[absolute_range_name(title, a1) for title, a1 in worksheets],
+            fields="sheets(properties/title,data(rowData(values(formattedValue,effectiveFormat/backgroundColor))))",
+        ).execute()
+
+    # Grid sheets come back in spreadsheet order, so key them by title
+    by_title: Dict[str, Tuple[List[List[str]], list]] = {}
+    for sheet_data in grid.get("sheets", []):
+        by_title[(sheet_data.get("properties") or {}).get("title")] = _values_and_colors(sheet_data)
+
+    out: Dict[str, Tuple[List[List[str]], list]] = {}
+    for title, a1 in worksheets:
+        if title not in by_title:
+            continue
+        rows, colors = by_title[title]
+        if a1 is None and rows:
+            rows = fill_gaps(rows)
+        out[title] = (rows, colors)
+    return out
@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import List, Dict, Tuple, Set
 import re
 
 from .client import get_gspread_client, get_sheets_service
-from .color_dump import get_worksheet_colors
+from .color_dump import WHITE, fetch_grid_bundle, worksheet_range
 
 
-def _is_white(color: dict) -> bool:
-    if not color:
-        return False
-    return color.get("r", 0) == 1 and color.get("g", 0) == 1 and color.get("b", 0) == 1
+# Long-lived worksheet fetch pool: get_sheets_service() is memoized per thread, so workers that
+# outlive a parse keep their discovery client and connection. Separate from parsers._EXECUTOR,
+# whose threads call into this parser and would deadlock waiting on their own pool.
+_WORKSHEET_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="elrora")
+
+
+def _is_white(color: int) -> bool:
+    return color == WHITE
 
 
 def _parse_date_range(token: str, month: int, year: int) -> Tuple[str, str] | None:
@@ -61,28 +66,28 @@ _MONTH_MAP = {
 }
 
 
-def _word_in_token(word: str, token: str) -> bool:
-    return re.search(rf"\b{re.escape(word)}\b", token) is not None
+# One alternation over every month key (longest first) instead of a regex search per key
+_MONTH_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(k) for k in sorted(_MONTH_MAP, key=len, reverse=True)) + r")\b"
+)
+# Position of each key in _MONTH_MAP; a cell with several months resolves to the earliest key
+_MONTH_RANK = {key: rank for rank, key in enumerate(_MONTH_MAP)}
 
 
 def _row_has_months(row: List[str]) -> bool:
-    upper = [str(c or "").strip().upper() for c in row]
     found = set()
-    for cell in upper:
-        for key in _MONTH_MAP.keys():
-            if _word_in_token(key, cell):
-                found.add(_MONTH_MAP[key])
+    for c in row:
+        for key in _MONTH_RE.findall(str(c or "").strip().upper()):
+            found.add(_MONTH_MAP[key])
     return len(found) >= 2
 
 
 def _collect_month_spans(header_row_vals: List[str], merged_ranges: List[Dict] = None) -> List[Dict]:
     month_headers: List[Tuple[int, int]] = []
     for j, cell in enumerate(header_row_vals):
-        token = (cell or "").strip().upper()
-        for key, mon in _MONTH_MAP.items():
-            if _word_in_token(key, token):
-                month_headers.append((j, mon))
-                break
+        keys = _MONTH_RE.findall((cell or "").strip().upper())
+        if keys:
+            month_headers.append((j, _MONTH_MAP[min(keys, key=_MONTH_RANK.__getitem__)]))
     month_headers.sort(key=lambda x: x[0])
     spans: List[Dict] = []
     
@@ -112,6 +117,117 @@ def _collect_month_spans(header_row_vals: List[str], merged_ranges: List[Dict] =
     return spans
 
 
+def _parse_worksheet(rows: List[List[str | None]], colors: List[List[int]], merged_ranges: List[Dict],
+                     boat_name: str, room_links: Tuple[str | None, ...], current_year: int) -> List[Dict]:
+    results: List[Dict] = []
+
+    # Classify every row once, then walk backwards so next_header[k] is the first header row after k
+    header_mask = [_row_has_months(row) for row in rows]
+    next_header: List[int | None] = [None] * len(rows)
+    nh = None
+    for k in range(len(rows) - 1, -1, -1):
+        next_header[k] = nh
+        if header_mask[k]:
+            nh = k
+
+    i = 0
+    while i < len(rows) - 2:
+        # Find a month header row
+        if not header_mask[i]:
+            i += 1
+            continue
+        header_row_idx = i
+        range_row_idx = i + 1
+        header_vals = rows[header_row_idx]
+        range_vals = rows[range_row_idx] if range_row_idx < len(rows) else []
+        month_spans = _collect_month_spans(header_vals, merged_ranges)
+
+        # Determine next header to bound this block
+        next_header_idx = next_header[range_row_idx]
+
+        # Collect room rows between range_row_idx+1 and next_header_idx (or until blank streak)
+        room_rows: List[Tuple[str, int]] = []
+        r = range_row_idx + 1
+        blank_streak = 0
+        while r < len(rows) and (next_header_idx is None or r < next_header_idx):
+            label = rows[r][1] if len(rows[r]) > 1 else None
+            if label:
+                room_rows.append((label, r))
+                blank_streak = 0
+            else:
+                blank_streak += 1
+                if blank_streak >= 2:
+                    # consider end of block
+                    break
+            r += 1
+
+        # For each room row, compute available dates across all month spans/columns
+        for idx_room, (label, r_idx) in enumerate(room_rows):
+            # Use sheet room name; link by index position if available
+            room_name = label
+            room_link = room_links[idx_room] if idx_room < len(room_links) else None
+
+            available_dates: List[date] = []
+            for span in month_spans:
+                mon = span["month"]
+                start_c = span["start_col"]
+                end_c = span["end_col"]
+                for col_idx in range(start_c, end_c + 1):
+                    token = range_vals[col_idx] if col_idx < len(range_vals) else None
+                    if token is None or '-' not in token:
+                        continue
+                    parsed = _parse_date_range(token, mon, current_year)
+                    if not parsed:
+                        continue
+                    start_str, _ = parsed
+                    start_dt = datetime.strptime(start_str, "%Y/%m/%d").date()
+                    
+                    # Check if this cell is part of a merged range that's occupied
+                    is_occupied = False
+                    if merged_ranges:
+                        for merge in merged_ranges:
+                            merge_start_row = merge.get('startRowIndex', 0)
+                            merge_end_row = merge.get('endRowIndex', 0)
+                            merge_start_col = merge.get('startColumnIndex', 0)
+                            merge_end_col = merge.get('endColumnIndex', 0)
+                            
+                            # Check if this cell is within a merged range
+                            if (merge_start_row <= r_idx < merge_end_row and
+                                merge_start_col <= col_idx < merge_end_col):
+                                # This cell is part of a merged range
+                                # Check if any cell in the merged range is colored (occupied)
+                                for mr in range(merge_start_row, merge_end_row):
+                                    for mc in range(merge_start_col, merge_end_col):
+                                        if (mr < len(colors) and mc < len(colors[mr]) and 
+                                            not _is_white(colors[mr][mc])):
+                                            is_occupied = True
+                                            break
+                                    if is_occupied:
+                                        break
+                                break
+                    
+                    # If not part of a merged range, check individual cell
+                    if not is_occupied and r_idx < len(colors) and col_idx < len(colors[r_idx]):
+                        is_occupied = not _is_white(colors[r_idx][col_idx])
+                    
+                    # Add to available dates only if not occupied
+                    if not is_occupied:
+                        available_dates.append(start_dt)
+
+            results.append({
+                "boat_name": boat_name,
+                "room_name": room_name,
+                "occupied": [],
+                "available_dates": available_dates,
+                "room_link": room_link,
+            })
+
+        # Advance to next header (or end)
+        i = next_header_idx if next_header_idx is not None else r
+
+    return results
+
+
 def parse_elrora_from_sheets(boat_name: str) -> List[Dict]:
     from ..config import BOAT_CATALOG, get_room_link
 
@@ -130,130 +246,17 @@ def parse_elrora_from_sheets(boat_name: str) -> List[Dict]:
 
     # Link mapping by index order from config
     config_rooms_order = list((BOAT_CATALOG[boat_name].get("rooms") or {}).keys())
+    room_links = tuple(get_room_link(boat_name, k) for k in config_rooms_order)
 
-    for ws in sheet.worksheets():
-        rows = ws.get('A1:ZZ1000')
+    def _process_ws(ws) -> List[Dict]:
+        # Service memoized per pool thread; the discovery client is not thread-safe
         service = get_sheets_service()
-        colors = get_worksheet_colors(service, sheet.id, ws.title)
-
-        # Get merged cell information from Google Sheets API v4
-        merged_ranges = []
-        try:
-            result = service.spreadsheets().get(
-                spreadsheetId=sheet.id,
-                ranges=[f'{ws.title}!A1:ZZ1000'],
-                includeGridData=False
-            ).execute()
-            
-            if 'sheets' in result and len(result['sheets']) > 0:
-                sheet_data = result['sheets'][0]
-                if 'merges' in sheet_data:
-                    merged_ranges = sheet_data['merges']
-        except Exception as e:
-            # Fallback to heuristic method if API call fails
-            pass
-
-        i = 0
-        while i < len(rows) - 2:
-            # Find a month header row
-            if not _row_has_months(rows[i]):
-                i += 1
-                continue
-            header_row_idx = i
-            range_row_idx = i + 1
-            header_vals = rows[header_row_idx]
-            range_vals = rows[range_row_idx] if range_row_idx < len(rows) else []
-            month_spans = _collect_month_spans(header_vals, merged_ranges)
-
-            # Determine next header to bound this block
-            j = range_row_idx + 1
-            next_header_idx = None
-            while j < len(rows):
-                if _row_has_months(rows[j]):
-                    next_header_idx = j
-                    break
-                j += 1
-
-            # Collect room rows between range_row_idx+1 and next_header_idx (or until blank streak)
-            room_rows: List[Tuple[str, int]] = []
-            r = range_row_idx + 1
-            blank_streak = 0
-            while r < len(rows) and (next_header_idx is None or r < next_header_idx):
-                label = (rows[r][1] if len(rows[r]) > 1 else '').strip()
-                if label:
-                    room_rows.append((label, r))
-                    blank_streak = 0
-                else:
-                    blank_streak += 1
-                    if blank_streak >= 2:
-                        # consider end of block
-                        break
-                r += 1
-
-            # For each room row, compute available dates across all month spans/columns
-            for idx_room, (label, r_idx) in enumerate(room_rows):
-                # Use sheet room name; link by index position if available
-                room_name = label
-                room_link = None
-                if idx_room < len(config_rooms_order):
-                    room_link = get_room_link(boat_name, config_rooms_order[idx_room])
-
-                available_dates: List[date] = []
-                for span in month_spans:
-                    mon = span["month"]
-                    start_c = span["start_col"]
-                    end_c = span["end_col"]
-                    for col_idx in range(start_c, end_c + 1):
-                        token = (range_vals[col_idx] if col_idx < len(range_vals) else '').strip()
-                        if not token or '-' not in token:
-                            continue
-                        parsed = _parse_date_range(token, mon, current_year)
-                        if not parsed:
-                            continue
-                        start_str, _ = parsed
-                        start_dt = datetime.strptime(start_str, "%Y/%m/%d").date()
-                        
-                        # Check if this cell is part of a merged range that's occupied
-                        is_occupied = False
-                        if merged_ranges:
-                            for merge in merged_ranges:
-                                merge_start_row = merge.get('startRowIndex', 0)
-                                merge_end_row = merge.get('endRowIndex', 0)
-                                merge_start_col = merge.get('startColumnIndex', 0)
-                                merge_end_col = merge.get('endColumnIndex', 0)
-                                
-                                # Check if this cell is within a merged range
-                                if (merge_start_row <= r_idx < merge_end_row and
-                                    merge_start_col <= col_idx < merge_end_col):
-                                    # This cell is part of a merged range
-                                    # Check if any cell in the merged range is colored (occupied)
-                                    for mr in range(merge_start_row, merge_end_row):
-                                        for mc in range(merge_start_col, merge_end_col):
-                                            if (mr < len(colors) and mc < len(colors[mr]) and 
-                                                not _is_white(colors[mr][mc])):
-                                                is_occupied = True
-                                                break
-                                        if is_occupied:
-                                            break
-                                    break
-                        
-                        # If not part of a merged range, check individual cell
-                        if not is_occupied and r_idx < len(colors) and col_idx < len(colors[r_idx]):
-                            is_occupied = not _is_white(colors[r_idx][col_idx])
-                        
-                        # Add to available dates only if not occupied
-                        if not is_occupied:
-                            available_dates.append(start_dt)
-
-                results.append({
-                    "boat_name": boat_name,
-                    "room_name": room_name,
-                    "occupied": [],
-                    "available_dates": available_dates,
-                    "room_link": room_link,
-                })
-
-            # Advance to next header (or end)
-            i = next_header_idx if next_header_idx is not None else r
+        rng = worksheet_range(ws.title, ws.row_count, ws.col_count)
+        rows, colors, merged_ranges = fetch_grid_bundle(service, sheet.id, ws.title, rng)
+        return _parse_worksheet(rows, colors, merged_ranges, boat_name, room_links, current_year)
+
+    # Worksheets are independent, so fetch and parse them concurrently (results keep sheet order)
+    for ws_results in _WORKSHEET_POOL.map(_process_ws, sheet.worksheets()):
+        results.extend(ws_results)
 
     return results
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple
 import re
 
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
 from .client import get_gspread_client, get_sheets_service
-from .color_dump import get_worksheet_colors, get_worksheet_borders
+from .cache import cached_fetch, get_modified_time
+from .color_dump import WHITE, get_worksheet_formats, worksheet_range
 
 
 _MONTH_MAP = {
@@ -26,49 +34,59 @@ _MONTH_MAP = {
 }
 
 
-def _word_in_token(word: str, token: str) -> bool:
-    token = (token or "").strip().upper()
-    return (" " + token + " ").find(" " + word.upper() + " ") != -1
+# Month keys as space-delimited words, matched in one pass (longest key first)
+_MONTH_RE = re.compile(
+    r"(?<![^ ])(?:" + "|".join(re.escape(k) for k in sorted(_MONTH_MAP, key=len, reverse=True)) + r")(?![^ ])"
+)
+# Position of each key in _MONTH_MAP; a cell with several months resolves to the earliest key
+_MONTH_RANK = {key: rank for rank, key in enumerate(_MONTH_MAP)}
+_DAY_RE = re.compile(r"^\s*(\d{1,2})")
+
 
+@lru_cache(maxsize=4096)
+def _cell_months(cell: str) -> Tuple[int, ...]:
+    """Months named in a normalized cell, ordered by key position in _MONTH_MAP (one scan per distinct cell)"""
+    keys = sorted(_MONTH_RE.findall(cell), key=_MONTH_RANK.__getitem__)
+    return tuple(_MONTH_MAP[k] for k in keys)
 
-def _find_month_header_row(rows: List[List[str]]) -> int | None:
-    for i, row in enumerate(rows):
-        upper = [str(c or "").strip().upper() for c in row]
+
+def _find_month_header_row(upper_rows: List[List[str]]) -> int | None:
+    for i, row in enumerate(upper_rows):
         found = set()
-        for cell in upper:
-            for key, mon in _MONTH_MAP.items():
-                if _word_in_token(key, cell):
-                    found.add(mon)
-        if len(found) >= 2:
-            return i
+        for c in row:
+            found.update(_cell_months(c))
+            # Two distinct months are enough; no need to scan the rest of the row
+            if len(found) >= 2:
+                return i
     return None
 
 
+@lru_cache(maxsize=1024)
+def _cell_day(raw) -> int | None:
+    """Leading day number of a cell (numeric cells as-is), or None; cached since day cells repeat"""
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    m = _DAY_RE.match(str(raw or ''))
+    return int(m.group(1)) if m else None
+
+
 def _find_day_row(rows: List[List[str]], month_header_idx: int) -> int | None:
     # Look for a row with many numeric day values after the month header
     for i in range(month_header_idx + 1, min(month_header_idx + 5, len(rows))):
-        row = rows[i]
-        numeric_count = 0
-        for cell in row:
-            if isinstance(cell, (int, float)) and 1 <= cell <= 31:
-                numeric_count += 1
-            elif isinstance(cell, str):
-                m = re.match(r"^(\d{1,2})", cell.strip())
-                if m and 1 <= int(m.group(1)) <= 31:
-                    numeric_count += 1
+        days = [_cell_day(cell) for cell in rows[i]]
+        numeric_count = sum(1 for d in days if d is not None and 1 <= d <= 31)
         if numeric_count >= 10:  # Should have many day numbers
             return i
     return None
 
 
 def _collect_month_spans(header_row_vals: List[str]) -> List[Dict]:
+    # header_row_vals is a pre-normalized (stripped, upper-cased) row
     month_headers: List[Tuple[int, int]] = []
     for j, cell in enumerate(header_row_vals):
-        token = (cell or "").strip().upper()
-        for key, mon in _MONTH_MAP.items():
-            if _word_in_token(key, token):
-                month_headers.append((j, mon))
-                break
+        months = _cell_months(cell)
+        if months:
+            month_headers.append((j, months[0]))
     month_headers.sort(key=lambda x: x[0])
     spans: List[Dict] = []
     for idx, (col, mon) in enumerate(month_headers):
@@ -77,41 +95,47 @@ def _collect_month_spans(header_row_vals: List[str]) -> List[Dict]:
     return spans
 
 
-def _normalize_section_label(boat_name: str) -> List[str]:
+@lru_cache(maxsize=512)
+def _normalize_section_label(boat_name: str) -> Tuple[str, ...]:
     up = boat_name.strip().upper()
     # known mismatch in sheet spelling
-    synonyms: Dict[str, List[str]] = {
-        "KANHA NATTA": ["KANHA NATHA", "KANHA NATA"],
-        "KANHA LOKA": ["KANHA LOKA"],
-        "KANHA CITTA": ["KANHA CITTA"],
+    synonyms: Dict[str, Tuple[str, ...]] = {
+        "KANHA NATTA": ("KANHA NATHA", "KANHA NATA"),
+        "KANHA LOKA": ("KANHA LOKA",),
+        "KANHA CITTA": ("KANHA CITTA",),
     }
     if up in synonyms:
         return synonyms[up]
-    return [up]
+    return (up,)
 
 
-def _find_boat_section(rows: List[List[str]], target_labels: List[str]) -> Dict | None:
-    def _norm(s: str) -> str:
-        return ''.join(ch for ch in s.upper() if ch.isalpha())
-    
-    target_norms = [_norm(lbl) for lbl in target_labels]
+# Deletes every non-letter in one C-level pass (replaces a per-character isalpha loop)
+_KEEP_ALPHA = str.maketrans('', '', ''.join(chr(c) for c in range(256) if not chr(c).isalpha()))
+
+
+@lru_cache(maxsize=4096)
+def _norm(s: str) -> str:
+    return s.upper().translate(_KEEP_ALPHA)
+
+
+def _find_boat_section(upper_rows: List[List[str]], target_labels: Tuple[str, ...]) -> Dict | None:
+    # One alternation over every accepted label instead of a substring probe per label
+    target_re = re.compile("|".join(re.escape(_norm(lbl)) for lbl in target_labels))
     
-    for i, row in enumerate(rows):
-        uppers = [str(c or '').strip().upper() for c in row]
-        if any(any(tn in _norm(cell) for tn in target_norms) for cell in uppers):
+    for i, row in enumerate(upper_rows):
+        # Section labels live in the first two columns (same cells the end-of-section check uses)
+        if any(target_re.search(_norm(c)) for c in row[:2] if c):
             # Find the end of this section (next section or blank streak)
             end_row = i + 1
             blank_streak = 0
-            while end_row < len(rows):
-                row = rows[end_row]
+            while end_row < len(upper_rows):
+                row = upper_rows[end_row]
                 # Check if this is another section
-                head0 = (row[0] if len(row) > 0 else '').strip().upper()
-                head1 = (row[1] if len(row) > 1 else '').strip().upper()
-                if head0.startswith('KANHA ') or head1.startswith('KANHA '):
+                if row[0].startswith('KANHA ') or row[1].startswith('KANHA '):
                     break
                 
                 # Check for blank lines
-                is_blank = all((str(c or '').strip() == '') for c in row[:10])
+                is_blank = all(c == '' for c in row[:10])
                 blank_streak = blank_streak + 1 if is_blank else 0
                 if blank_streak >= 8:
                     break
@@ -122,18 +146,18 @@ def _find_boat_section(rows: List[List[str]], target_labels: List[str]) -> Dict
     return None
 
 
-def _detect_ot_bands(rows: List[List[str]], borders: List[List[Dict]], date_row_idx: int, section_start: int, section_end: int) -> Dict:
-    def is_bold(style: str | None) -> bool:
-        return style in {"SOLID_MEDIUM", "SOLID_THICK", "DOUBLE"}
-    
+_BOLD_STYLES = frozenset({"SOLID_MEDIUM", "SOLID_THICK", "DOUBLE"})
+
+
+def _detect_ot_bands(upper_rows: List[List[str]], borders: List[List[Dict]], border_widths: List[int],
+                     date_row_idx: int, section_start: int, section_end: int) -> Dict:
     # Find a row with many OT-like markers to serve as band row
     # Search only within the boat section boundaries
     bands_row_idx = None
     best_ot_count = 0
     
-    for r_idx in range(section_start, min(section_end + 1, len(rows))):
-        upper = [str(c or '').strip().upper() for c in rows[r_idx]]
-        ot_count = sum(1 for c in upper if c == 'OT' or c == 'PRIVATE' or 'UPGRADE' in c)
+    for r_idx in range(section_start, min(section_end + 1, len(upper_rows))):
+        ot_count = sum(1 for c in upper_rows[r_idx] if c == 'OT' or c == 'PRIVATE' or 'UPGRADE' in c)
         if ot_count >= 3:
             bands_row_idx = r_idx
             break
@@ -147,107 +171,89 @@ def _detect_ot_bands(rows: List[List[str]], borders: List[List[Dict]], date_row_
     
     # First, collect all OT marker columns
     ot_cols: List[int] = []
-    for j, cell in enumerate(rows[bands_row_idx]):
-        if j < len(rows[bands_row_idx]):
-            token = (rows[bands_row_idx][j] or '').strip().upper()
-            if token == 'OT' or token == 'PRIVATE' or 'UPGRADE' in token:
-                ot_cols.append(j)
+    for j, token in enumerate(upper_rows[bands_row_idx]):
+        if token == 'OT' or token == 'PRIVATE' or 'UPGRADE' in token:
+            ot_cols.append(j)
     
     # Find the CABIN/ROOM header row to use for borders
     # IMPORTANT: restrict search to the current boat section to avoid picking
     # headers from another section (e.g., Loka while parsing Natta/Citta)
     header_border_row_idx = None
-    for i in range(section_start, min(section_end + 1, len(rows))):
-        a = (rows[i][0] if len(rows[i]) > 0 else '').strip().upper()
-        b = (rows[i][1] if len(rows[i]) > 1 else '').strip().upper()
-        if 'CABIN' in a and 'ROOM' in b:
+    for i in range(section_start, min(section_end + 1, len(upper_rows))):
+        row = upper_rows[i]
+        if 'CABIN' in row[0] and 'ROOM' in row[1]:
             header_border_row_idx = i
             break
     # Fallback: small window around bands_row_idx if not found inside section
     if header_border_row_idx is None:
         start_i = max(0, bands_row_idx - 5)
-        end_i = min(len(rows), bands_row_idx + 6)
+        end_i = min(len(upper_rows), bands_row_idx + 6)
         for i in range(start_i, end_i):
-            a = (rows[i][0] if len(rows[i]) > 0 else '').strip().upper()
-            b = (rows[i][1] if len(rows[i]) > 1 else '').strip().upper()
-            if 'CABIN' in a and 'ROOM' in b:
+            row = upper_rows[i]
+            if 'CABIN' in row[0] and 'ROOM' in row[1]:
                 header_border_row_idx = i
                 break
     
     # Use header row for borders, fallback to OT row if not found
     border_row_idx = header_border_row_idx if header_border_row_idx is not None else bands_row_idx
     
+    # Precompute band boundaries on the border row once:
+    # left boundary = bold left border on the cell OR bold right border on the previous cell,
+    # right boundary = bold right border on the cell OR bold left border on the next cell
+    row_borders = borders[border_row_idx]
+    border_row = upper_rows[border_row_idx]
+    # Rows are padded to a common width; the band fallback end is the row's last filled column
+    row_width = len(border_row)
+    while row_width and not border_row[row_width - 1]:
+        row_width -= 1
+    # Only the fetched border cells count; the {} padding past them must not form boundaries
+    n = border_widths[border_row_idx] if border_row_idx < len(border_widths) else 0
+    # Decode the border dicts once into flat 0/1 byte arrays, so the scan reads plain ints
+    left_bold = bytearray(b.get("left") in _BOLD_STYLES for b in row_borders[:n])
+    right_bold = bytearray(b.get("right") in _BOLD_STYLES for b in row_borders[:n])
+    left_bd: List[int] = []
+    right_bd: List[int] = []
+    for j in range(n):
+        if left_bold[j] or (j > 0 and right_bold[j - 1]):
+            left_bd.append(j)
+        if j < row_width and (right_bold[j] or (j + 1 < row_width and j + 1 < n and left_bold[j + 1])):
+            right_bd.append(j)
+
     # For each OT column, expand to nearest bold borders to form a band
     bands: List[Tuple[int, int]] = []
     for c in ot_cols:
-        # search for start: look for bold left border on current cell OR bold right border on previous cell
-        start = None
-        j = c
-        while j >= 0:
-            if (border_row_idx < len(borders) and j < len(borders[border_row_idx])):
-                left_style = borders[border_row_idx][j].get("left")
-                right_style = borders[border_row_idx][j].get("right")
-                # Check if current cell has bold left border
-                if is_bold(left_style):
-                    start = j
-                    break
-                # Check if previous cell has bold right border
-                if j > 0 and border_row_idx < len(borders) and j-1 < len(borders[border_row_idx]):
-                    prev_right_style = borders[border_row_idx][j-1].get("right")
-                    if is_bold(prev_right_style):
-                        start = j
-                        break
-            j -= 1
-        # Fallback to column 0 if no start border found
-        if start is None:
-            start = 0
+        # Nearest left boundary at or before c; fallback to column 0 if none
+        k = bisect_right(left_bd, c)
+        start = left_bd[k - 1] if k else 0
+        # Nearest right boundary at or after c; fallback to last column if none
+        k = bisect_left(right_bd, c)
+        end = right_bd[k] if k < len(right_bd) else row_width - 1
         
-        # search for end: look for bold right border on current cell OR bold left border on next cell
-        end = None
-        j = c
-        while j < len(rows[border_row_idx]):
-            if (border_row_idx < len(borders) and j < len(borders[border_row_idx])):
-                left_style = borders[border_row_idx][j].get("left")
-                right_style = borders[border_row_idx][j].get("right")
-                # Check if current cell has bold right border
-                if is_bold(right_style):
-                    end = j
-                    break
-                # Check if next cell has bold left border
-                if j + 1 < len(rows[border_row_idx]) and border_row_idx < len(borders) and j+1 < len(borders[border_row_idx]):
-                    next_left_style = borders[border_row_idx][j+1].get("left")
-                    if is_bold(next_left_style):
-                        end = j
-                        break
-            j += 1
-        # Fallback to last column if no end border found
-        if end is None:
-            end = len(rows[border_row_idx]) - 1
-        
-        if start is not None and end is not None and end >= start:
+        if end >= start:
             bands.append((start, end))
     
     return {"bands": bands, "ot_row_idx": bands_row_idx}
 
 
-def _col_to_date(rows: List[List[str]], day_idx: int | None, month_spans: List[Dict], col: int, default_year: int = 2025) -> str | None:
+def _month_by_col(month_spans: List[Dict], width: int) -> List[int | None]:
+    """Month of every column in [0, width), so date lookups index instead of scanning spans"""
+    month_by_col: List[int | None] = [None] * width
+    # Fill in reverse so the first matching span wins, as in a forward scan
+    for s in reversed(month_spans):
+        for c in range(s["start_col"], min(s["end_col"], width - 1) + 1):
+            month_by_col[c] = s["month"]
+    return month_by_col
+
+
+def _col_to_date(rows: List[List[str]], day_idx: int | None, month_by_col: List[int | None], col: int, default_year: int = 2025) -> str | None:
     if day_idx is None:
         return None
-    month = None
-    for s in month_spans:
-        if s["start_col"] <= col <= s["end_col"]:
-            month = s["month"]
-            break
+    month = month_by_col[col] if col < len(month_by_col) else None
     if month is None:
         return None
-    raw = rows[day_idx][col] if col < len(rows[day_idx]) else ''
-    if isinstance(raw, (int, float)):
-        day = int(raw)
-    else:
-        m = re.match(r"^(\d{1,2})", str(raw or '').strip())
-        if not m:
-            return None
-        day = int(m.group(1))
+    day = _cell_day(rows[day_idx][col])
+    if day is None:
+        return None
     try:
         d = date(default_year, month, day)
         return d.isoformat()
@@ -255,24 +261,15 @@ def _col_to_date(rows: List[List[str]], day_idx: int | None, month_spans: List[D
         return f"{default_year:04d}-{month:02d}-{day:02d}"
 
 
-def _col_to_date_fallback(rows: List[List[str]], month_spans: List[Dict], col: int, default_year: int = 2025, search_start: int = 0, search_end: int = 10) -> str | None:
+def _col_to_date_fallback(rows: List[List[str]], month_by_col: List[int | None], col: int, default_year: int = 2025, search_start: int = 0, search_end: int = 10) -> str | None:
     # Search a vertical window for any row that has a day number at the given column
-    month = None
-    for s in month_spans:
-        if s["start_col"] <= col <= s["end_col"]:
-            month = s["month"]
-            break
+    month = month_by_col[col] if col < len(month_by_col) else None
     if month is None:
         return None
     for r in range(max(0, search_start), min(len(rows), search_end + 1)):
-        raw = rows[r][col] if col < len(rows[r]) else ''
-        if isinstance(raw, (int, float)):
-            day = int(raw)
-        else:
-            m = re.match(r"^(\d{1,2})", str(raw or '').strip())
-            if not m:
-                continue
-            day = int(m.group(1))
+        day = _cell_day(rows[r][col])
+        if day is None:
+            continue
         try:
             d = date(default_year, month, day)
             return d.isoformat()
@@ -281,52 +278,72 @@ def _col_to_date_fallback(rows: List[List[str]], month_spans: List[Dict], col: i
     return None
 
 
-def _is_white(color: dict | None) -> bool:
-    # Treat missing/None as white (default sheet background)
-    if not color:
-        return True
-    # Check for white RGB values
-    if color.get("r", 0) == 1 and color.get("g", 0) == 1 and color.get("b", 0) == 1:
-        return True
-    # Check for black RGB (0,0,0) - often represents transparent/no-fill cells
-    if color.get("r", 0) == 0 and color.get("g", 0) == 0 and color.get("b", 0) == 0:
-        return True
-    # Check for indexed white (64, 65)
-    indexed = color.get("indexed")
-    if isinstance(indexed, int) and indexed in (64, 65):
-        return True
-    return False
-
-
-def _get_room_link_from_sheet(worksheet, row_idx: int, col_idx: int) -> str | None:
-    """Extract hyperlink from a specific cell in the worksheet"""
+# Padding for cells outside the fetched color grid; never white, like a missing cell
+_MISSING = 0xFFFFFFFF
+
+
+def _pad_grid(rows: List[List[str]], upper_rows: List[List[str]], colors: List, borders: List[List[Dict]]) -> List[int]:
+    """Pad rows/colors/borders in place to one rectangular shape so scans can index cells unguarded.
+
+    Returns each border row's width before padding.
+    """
+    border_widths = [len(b) for b in borders]
+    height = len(rows)
+    width = max(2, max((len(r) for r in rows), default=0))
+    for grid in (rows, upper_rows):
+        for r in grid:
+            if len(r) < width:
+                r.extend([''] * (width - len(r)))
+    while len(colors) < height:
+        colors.append(array("I"))
+    for c in colors:
+        if len(c) < width:
+            c.extend([_MISSING] * (width - len(c)))
+    while len(borders) < height:
+        borders.append([])
+    for b in borders:
+        if len(b) < width:
+            b.extend([{}] * (width - len(b)))
+    return border_widths
+
+
+# Long-lived pool for the formats fetch that overlaps the values fetch; its threads keep their
+# memoized Sheets service across parses. One worker per Kanha boat, which parsers run concurrently.
+_FORMATS_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="kanha")
+
+
+# Packed colors that count as white: white itself and black (0) - often transparent/no-fill cells
+_WHITE_IDS = frozenset({0, WHITE})
+
+
+def _get_room_links_from_sheet(service, spreadsheet_id: str, worksheet_title: str, cells: List[Tuple[int, int]]) -> Dict[Tuple[int, int], str]:
+    """Extract hyperlinks for many (row, col) cells of the worksheet in a single API call"""
+    if not cells:
+        return {}
     try:
-        service = get_sheets_service()
-        spreadsheet_id = worksheet.spreadsheet.id
-        
-        # Get hyperlinks for the specific cell
-        request = service.spreadsheets().get(
+        response = service.spreadsheets().get(
             spreadsheetId=spreadsheet_id,
-            ranges=[f"{worksheet.title}!{chr(65 + col_idx)}{row_idx + 1}"],  # Convert to A1 notation
-            includeGridData=True
-        )
-        response = request.execute()
-        
-        if 'sheets' in response and len(response['sheets']) > 0:
-            sheet_data = response['sheets'][0]['data'][0]
-            
-            if 'rowData' in sheet_data and len(sheet_data['rowData']) > 0:
-                row_data = sheet_data['rowData'][0]
-                if 'values' in row_data and len(row_data['values']) > 0:
-                    cell_data = row_data['values'][0]
-                    if 'hyperlink' in cell_data:
-                        return cell_data['hyperlink']
-        
-        return None
+            ranges=[absolute_range_name(worksheet_title, rowcol_to_a1(row_idx + 1, col_idx + 1)) for row_idx, col_idx in cells],
+            includeGridData=True,
+            fields="sheets(data(startRow,startColumn,rowData(values(hyperlink))))",
+        ).execute()
     except Exception:
-        return None
-
-
+        return {}
+
+    links: Dict[Tuple[int, int], str] = {}
+    for sheet_data in response.get('sheets', []):
+        for block in sheet_data.get('data', []):
+            # startRow/startColumn are omitted when zero
+            key = (block.get('startRow', 0), block.get('startColumn', 0))
+            row_data = block.get('rowData') or []
+            if row_data and row_data[0].get('values'):
+                hyperlink = row_data[0]['values'][0].get('hyperlink')
+                if hyperlink:
+                    links[key] = hyperlink
+    return links
+
+
+@lru_cache(maxsize=512)
 def _map_sheet_room_to_config_room(sheet_room_name: str) -> str | None:
     """Map sheet room name to config room name for Kanha Loka"""
     # Normalize the sheet room name for matching
@@ -379,29 +396,49 @@ def parse_kanha_from_sheets(boat_name: str) -> List[Dict]:
 
     # Process only the target worksheet
     ws = target_ws
-    rows = ws.get('A1:ZZ2000')
+    # Bound every fetch to the worksheet's real grid instead of a fixed A1:ZZ2000 box
+    values_range = f"A1:{rowcol_to_a1(max(ws.row_count, 1), max(ws.col_count, 1))}"
+    grid_range = worksheet_range(ws.title, ws.row_count, ws.col_count)
+
+    def _fetch_formats():
+        # Service memoized per pool thread; the discovery client is not thread-safe
+        return get_worksheet_formats(get_sheets_service(), sheet.id, ws.title, grid_range)
+
+    def _fetch_grid():
+        # Values and formats are independent requests, so overlap their round-trips:
+        # formats on the pool, values on this thread
+        formats_future = _FORMATS_POOL.submit(_fetch_formats)
+        rows = ws.get(values_range)
+        colors, borders = formats_future.result()
+        return rows, colors, borders
+
+    # Every Kanha boat reads the same worksheet; reuse it from disk until the spreadsheet changes
+    rows, colors, borders = cached_fetch(sheet.id, "kanha", ws.title, get_modified_time(sheet.id), _fetch_grid)
     service = get_sheets_service()
-    colors = get_worksheet_colors(service, sheet.id, ws.title)
-    borders = get_worksheet_borders(service, sheet.id, ws.title)
+
+    # Strip/upper-case every cell once; the header, section and band scans all read this copy
+    upper_rows = [[('' if c is None else str(c)).strip().upper() for c in r] for r in rows]
 
     # Find month header and day rows
-    header_idx = _find_month_header_row(rows)
+    header_idx = _find_month_header_row(upper_rows)
     if header_idx is None:
         return []
     
     day_idx = _find_day_row(rows, header_idx)
-    month_spans = _collect_month_spans(rows[header_idx])
+    month_spans = _collect_month_spans(upper_rows[header_idx])
     if not month_spans:
         return []
 
+    border_widths = _pad_grid(rows, upper_rows, colors, borders)
+
     # Find boat section
-    section = _find_boat_section(rows, target_labels)
+    section = _find_boat_section(upper_rows, target_labels)
     if not section:
         return []
 
     # Detect OT bands (limited to the boat section)
     # Use the same day_idx (date row) for all boats, but limit OT detection to boat section
-    otinfo = _detect_ot_bands(rows, borders, day_idx, section["start_row"], section["end_row"])
+    otinfo = _detect_ot_bands(upper_rows, borders, border_widths, day_idx, section["start_row"], section["end_row"])
     if not otinfo.get("bands"):
         return []
 
@@ -411,81 +448,81 @@ def parse_kanha_from_sheets(boat_name: str) -> List[Dict]:
     
     # Group rows by (room_name, cabin_number)
     # Handle multi-row cabins where cabin number might only be in first row
-    room_groups: Dict[Tuple[str, int], List[int]] = {}
+    room_groups: Dict[Tuple[str, int], List[int]] = defaultdict(list)
     current_cabin = None
     current_room = None
     
     for r in range(start_row, min(end_row + 1, len(rows))):
         row = rows[r]
-        first_cell = (row[0] if len(row) > 0 else '').strip()
-        room_label = (row[1] if len(row) > 1 else '').strip()
+        first_cell = row[0].strip()
+        room_label = row[1].strip()
+
+        # Parse the cabin number once; a leading sign is not a cabin number
+        try:
+            cabin = int(first_cell) if first_cell[:1].isdigit() else None
+        except ValueError:
+            cabin = None
 
         # If this row has a cabin number, it's the start of a new cabin
-        if first_cell.isdigit() and room_label:
-            try:
-                current_cabin = int(first_cell)
-                current_room = room_label
-                key = (current_room, current_cabin)
-                if key not in room_groups:
-                    room_groups[key] = []
-                room_groups[key].append(r)
-            except ValueError:
-                continue
+        if cabin is not None and room_label:
+            current_cabin = cabin
+            current_room = room_label
+            room_groups[(current_room, current_cabin)].append(r)
         # If this row doesn't have a cabin number, it might be a continuation of the previous cabin
-        elif not first_cell.isdigit() and current_cabin is not None and current_room is not None:
+        elif cabin is None and current_cabin is not None and current_room is not None:
             # Check if this looks like a continuation row (empty or same room type)
             if not room_label or room_label == current_room:
-                key = (current_room, current_cabin)
-                if key not in room_groups:
-                    room_groups[key] = []
-                room_groups[key].append(r)
+                room_groups[(current_room, current_cabin)].append(r)
         # If this row has a different room label, reset current cabin
         elif room_label and room_label != current_room:
             current_cabin = None
             current_room = None
     
+    # Fetch the hyperlink of every room's label cell (column 2, 0-indexed as 1) in one request
+    sheet_links = _get_room_links_from_sheet(
+        service, sheet.id, ws.title, [(room_rows[0], 1) for room_rows in room_groups.values()]
+    )
+
+    band_cols = [start_col for start_col, _ in otinfo["bands"]]
+    month_by_col = _month_by_col(month_spans, len(rows[0]) if rows else 0)
+
+    # Date of each band start column, resolved once and shared by every room group
+    col_to_date: Dict[int, date | None] = {}
+    for start_col in band_cols:
+        if start_col in col_to_date:
+            continue
+        # Get date for this column using the standard date row
+        iso_date = _col_to_date(rows, day_idx, month_by_col, start_col, current_year)
+        if iso_date is None:
+            # fallback: search near the date row for day numbers
+            iso_date = _col_to_date_fallback(rows, month_by_col, start_col, current_year, day_idx - 3, day_idx + 3)
+        try:
+            col_to_date[start_col] = datetime.fromisoformat(iso_date).date() if iso_date else None
+        except ValueError:
+            col_to_date[start_col] = None
+
+    # White flag of every room row at each band's start column, computed once for all groups
+    white_mask: Dict[int, List[bool]] = {}
+    for room_rows in room_groups.values():
+        for r in room_rows:
+            if r in white_mask:
+                continue
+            color_row = colors[r]
+            white_mask[r] = [color_row[c] in _WHITE_IDS for c in band_cols]
+
     # Process each room group (by room label and cabin number)
     for (room_label, cabin_no), room_rows in room_groups.items():
         available_dates: List[date] = []
         
-        # For each OT band, check availability at the start column
-        for start_col, end_col in otinfo["bands"]:
-            # Get date for this column using the standard date row
-            iso_date = _col_to_date(rows, day_idx, month_spans, start_col, current_year)
-            if iso_date is None:
-                # fallback: search near the date row for day numbers
-                iso_date = _col_to_date_fallback(rows, month_spans, start_col, current_year, day_idx - 3, day_idx + 3)
-            
-            if iso_date is None:
-                continue
-            
-            # Check if room is available: ANY row in this room group is white at this column
-            is_available = False
-            scanned_cells = []
-            for r in room_rows:
-                if (r < len(colors) and start_col < len(colors[r])):
-                    cell_color = colors[r][start_col]
-                    is_white = _is_white(cell_color)
-                    scanned_cells.append({
-                        "row": r,
-                        "col": start_col,
-                        "is_white": is_white,
-                        "color": cell_color
-                    })
-                    if is_white:
-                        is_available = True
-                        break
-            
-            
-            if is_available:
-                try:
-                    parsed_date = datetime.fromisoformat(iso_date).date()
-                    available_dates.append(parsed_date)
-                except ValueError:
-                    pass
+        # Room is available at a band if ANY row in its group is white at the start column
+        room_masks = [white_mask[r] for r in room_rows]
+        for b, start_col in enumerate(band_cols):
+            parsed_date = col_to_date[start_col]
+            if parsed_date is not None and any(mask[b] for mask in room_masks):
+                available_dates.append(parsed_date)
 
         # Get room link: first try to extract from sheet hyperlink, then fallback to config
-        room_link = _get_room_link_from_sheet(ws, room_rows[0], 1)  # Check column 2 (0-indexed as 1)
+        room_link = sheet_links.get((room_rows[0], 1))
         if not room_link:
             # Try to map sheet room name to config room name
             config_room_name = _map_sheet_room_to_config_room(room_label)
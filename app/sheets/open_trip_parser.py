@@ -1,22 +1,51 @@
 import os
 import csv
 import json
+import logging
 import re
 from datetime import date, timedelta
 from typing import Dict, List, Tuple, Optional
 import calendar
+from functools import lru_cache
+
+from .color_dump import WHITE
+
 
 MONTH_MAP = {
     "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "APL": 4, "MAY": 5, "JUN": 6, "JUNI": 6,
-    "JUL": 7, "JUL ": 7, "AUG": 8, "AGT": 8, "SEPT": 9, "SEP": 9,
+    "JUL": 7, "AUG": 8, "AGT": 8, "SEPT": 9, "SEP": 9,
     "OCT": 10, "NOV": 11, "DEC": 12, "DES": 12,
 }
 
 
+logger = logging.getLogger(__name__)
+
+# The parser reads sheet rows 29 (date ranges) to 38 (last room) only
+_FIRST_ROW = 29
+_LAST_ROW = 38
+
+
+# Room name mapping - keep BERN children separate
+_ROOM_NAME_MAP = {
+    "PARIS ROOM": "Paris",
+    "OSAKA ROOM": "Osaka",
+    "ATHENS ROOM": "Athena",
+    "PRAHA ROOM": "Praha",
+    "VENICE ROOM": "Venice",
+    "BERN ROOM (SHARING) 1": "Bern (sharing) 1",
+    "BERN ROOM (SHARING) 2": "Bern (sharing) 2",
+    "BERN ROOM (SHARING) 3": "Bern (sharing) 3",
+    "BERN ROOM (SHARING) 4": "Bern (sharing) 4",
+}
+# str.startswith() accepts a tuple, so non-room labels are rejected in one call
+_ROOM_PREFIXES = tuple(_ROOM_NAME_MAP)
+
+
 def _to_year() -> int:
     return 2025
 
 
+@lru_cache(maxsize=256)
 def _normalize_month(label: str) -> Optional[int]:
     if not label:
         return None
@@ -39,56 +68,44 @@ def _next_month(year: int, month: int) -> Tuple[int, int]:
     return year, month + 1
 
 
+# "<Mon>[-<Mon>]\n<day>-<day>", e.g. "Sept \n12-14" or "May-Jun\n30-01".
+# [^\S\n] is whitespace other than the newline, so exactly one line break is allowed.
+_DATE_RANGE_RE = re.compile(r"^\s*([A-Za-z]+)[^\S\n]*(?:-[^\S\n]*([A-Za-z]+)[^\S\n]*)?\n[^\S\n]*(\d+)[^\S\n]*-[^\S\n]*(\d+)\s*$")
+
+
+@lru_cache(maxsize=4096)
 def _parse_date_range_cell(cell_value: str) -> Optional[Tuple[date, date]]:
-    """Parse date range from cell like 'Sept \n12-14' or 'May-Jun\n30-01'"""
-    if not cell_value or not cell_value.strip():
+    """Parse date range from cell like 'Sept \n12-14' or 'May-Jun\n30-01'
+
+    Cached: the same header cells come back on every refresh and the result is immutable.
+    """
+    if not cell_value:
+        return None
+    m = _DATE_RANGE_RE.match(cell_value)
+    if not m:
         return None
+    start_month, end_month, start_day, end_day = m.groups()
     
-    # Split by newline to separate month and date range
-    parts = cell_value.strip().split('\n')
-    if len(parts) != 2:
+    # Parse month(s); a single month covers both ends
+    start_month_num = _normalize_month(start_month)
+    end_month_num = _normalize_month(end_month) if end_month else start_month_num
+    if not start_month_num or not end_month_num:
         return None
     
-    month_part = parts[0].strip()
-    date_part = parts[1].strip()
+    start_day_num = int(start_day)
+    end_day_num = int(end_day)
     
-    # Parse month(s)
-    if '-' in month_part:
-        # Cross-month range like "May-Jun"
-        start_month, end_month = month_part.split('-')
-        start_month_num = _normalize_month(start_month.strip())
-        end_month_num = _normalize_month(end_month.strip())
-        if not start_month_num or not end_month_num:
-            return None
+    # Handle cross-month date ranges
+    if start_day_num > end_day_num:
+        # Cross-month: e.g., "30-01" means 30th of start month to 1st of end month
+        start_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, start_day_num))
+        end_date = date(2025, end_month_num, _clamp_day(2025, end_month_num, end_day_num)) + timedelta(days=1)
     else:
-        # Single month
-        month_num = _normalize_month(month_part)
-        if not month_num:
-            return None
-        start_month_num = end_month_num = month_num
+        # Same month: e.g., "12-14" means 12th to 14th of same month
+        start_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, start_day_num))
+        end_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, end_day_num)) + timedelta(days=1)
     
-    # Parse date range
-    if '-' in date_part:
-        start_day, end_day = date_part.split('-')
-        try:
-            start_day_num = int(start_day.strip())
-            end_day_num = int(end_day.strip())
-            
-            # Handle cross-month date ranges
-            if start_day_num > end_day_num:
-                # Cross-month: e.g., "30-01" means 30th of start month to 1st of end month
-                start_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, start_day_num))
-                end_date = date(2025, end_month_num, _clamp_day(2025, end_month_num, end_day_num)) + timedelta(days=1)
-            else:
-                # Same month: e.g., "12-14" means 12th to 14th of same month
-                start_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, start_day_num))
-                end_date = date(2025, start_month_num, _clamp_day(2025, start_month_num, end_day_num)) + timedelta(days=1)
-            
-            return (start_date, end_date)
-        except ValueError:
-            return None
-    
-    return None
+    return (start_date, end_date)
 
 
 def _read_csv_rows(csv_path: str) -> List[List[str]]:
@@ -96,23 +113,23 @@ def _read_csv_rows(csv_path: str) -> List[List[str]]:
         return list(csv.reader(f))
 
 
-def _read_colors(json_path: str) -> List[List[Dict[str, Optional[float]]]]:
+def _read_colors(json_path: str) -> List[List[int]]:
+    from app.sheets.color_dump import colors_from_json
     with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
+        return colors_from_json(json.load(f))
 
-def _is_white(color: Dict[str, Optional[float]]) -> bool:
-    if color is None:
-        return True
-    r = color.get('r'); g = color.get('g'); b = color.get('b')
-    return (r is None and g is None and b is None) or (r == 1 and g == 1 and b == 1)
 
+def parse_open_trip_from_sheets(boat_name: str, worksheet_title: str = "OPEN TRIP",
+                                prefetched: Optional[Tuple[List[List[str]], list]] = None) -> Tuple[List[Dict], set]:
+    """Parse OPEN TRIP data directly from Google Sheets, returns (rooms, all_sheet_start_dates)
 
-def parse_open_trip_from_sheets(boat_name: str, worksheet_title: str = "OPEN TRIP") -> Tuple[List[Dict], set]:
-    """Parse OPEN TRIP data directly from Google Sheets, returns (rooms, all_sheet_start_dates)"""
+    Pass `prefetched` (rows, colors) from a batched fetch to skip the per-boat API calls.
+    """
     from app.config import BOAT_CATALOG
-    from app.sheets.client import get_gspread_client, get_sheets_service
+    from app.sheets.client import get_sheets_service
     from app.sheets.color_dump import get_worksheet_colors
+    from app.sheets.sampler import extract_spreadsheet_id
+    from gspread.utils import absolute_range_name
     
     if boat_name not in BOAT_CATALOG:
         return [], set()
@@ -122,124 +139,97 @@ def parse_open_trip_from_sheets(boat_name: str, worksheet_title: str = "OPEN TRI
         return [], set()
     
     try:
-        # Get gspread client and open the sheet
-        gc = get_gspread_client()
-        sheet = gc.open_by_url(sheet_link)
-        worksheet = sheet.worksheet(worksheet_title)
-        
-        # Get all values from the worksheet
-        rows = worksheet.get_all_values()
-        
-        # Get colors using the sheets service
-        sheets_service = get_sheets_service()
-        colors = get_worksheet_colors(sheets_service, sheet.id, worksheet_title)
-        
-        # Parse room data
-        rooms = _parse_open_trip_data(rows, colors, boat_name)
-        
-        # Extract all sheet start dates from the same data
-        all_sheet_start_dates = set()
-        if len(rows) >= 29:
-            date_range_row = rows[28]  # Row 29: Date ranges
-            for c, cell_value in enumerate(date_range_row):
-                rng = _parse_date_range_cell(cell_value)
-                if rng:
-                    start_date, end_date = rng
-                    all_sheet_start_dates.add(start_date)
+        if prefetched is not None:
+            rows, colors = prefetched
+        else:
+            # Fetch only the rows the parser reads instead of the whole worksheet
+            spreadsheet_id = extract_spreadsheet_id(sheet_link)
+            section = absolute_range_name(worksheet_title, f"{_FIRST_ROW}:{_LAST_ROW}")
+            sheets_service = get_sheets_service()
+            section_rows = sheets_service.spreadsheets().values().get(
+                spreadsheetId=spreadsheet_id,
+                range=section,
+            ).execute().get("values", [])
+            section_colors = get_worksheet_colors(sheets_service, spreadsheet_id, worksheet_title, rng=section)
+            
+            # The API drops trailing empty rows; pad the section back to full height, then put
+            # empty placeholders in front so sheet row 29 is still rows[28]
+            height = _LAST_ROW - _FIRST_ROW + 1
+            section_rows += [[] for _ in range(height - len(section_rows))]
+            section_colors += [[] for _ in range(height - len(section_colors))]
+            rows = [[] for _ in range(_FIRST_ROW - 1)] + section_rows
+            colors = [[] for _ in range(_FIRST_ROW - 1)] + section_colors
         
-        return rooms, all_sheet_start_dates
+        # Room data and all sheet start dates come from the same pass over row 29
+        return _parse_open_trip_data(rows, colors, boat_name)
         
     except Exception as e:
-        print(f"Error parsing {boat_name} sheet: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error parsing %s sheet: %s", boat_name, e)
         return [], set()
 
 
-def _parse_open_trip_data(rows: List[List[str]], colors: List[List[Dict]], boat_name: str) -> List[Dict]:
-    """Parse OPEN TRIP data from rows and colors arrays"""
+def _parse_open_trip_data(rows: List[List[str]], colors: List[List[int]], boat_name: str) -> Tuple[List[Dict], set]:
+    """Parse OPEN TRIP data from rows and colors arrays, returns (rooms, all_sheet_start_dates)"""
     # Focus on rows 29-38 (0-indexed: 28-37)
     # Row 29 (0-indexed: 28): Date ranges like "Sept \n12-14"
     # Rows 30-38 (0-indexed: 29-37): Room data
     
-    if len(rows) < 38:  # Need at least 38 rows
-        return []
+    if len(rows) < 29:
+        return [], set()
     
     date_range_row = rows[28]  # Row 29: Date ranges
-    room_rows = rows[29:38]    # Rows 30-38: Room data
     
-    # Parse date ranges from row 29
-    col_to_range: Dict[int, Optional[Tuple[date, date]]] = {}
+    # Parse date ranges from row 29: every range is a sheet start date, and room columns
+    # (from column 3) that hold one are kept with dates formatted once here.
+    all_sheet_start_dates = set()
+    valid_cols: List[Tuple[int, str, str]] = []
     
     for c, cell_value in enumerate(date_range_row):
         rng = _parse_date_range_cell(cell_value)
-        col_to_range[c] = rng
-
-    # Room name mapping - keep BERN children separate
-    room_name_map = {
-        "PARIS ROOM": "Paris",
-        "OSAKA ROOM": "Osaka", 
-        "ATHENS ROOM": "Athena",
-        "PRAHA ROOM": "Praha",
-        "VENICE ROOM": "Venice",
-        "BERN ROOM (SHARING) 1": "Bern (sharing) 1",
-        "BERN ROOM (SHARING) 2": "Bern (sharing) 2", 
-        "BERN ROOM (SHARING) 3": "Bern (sharing) 3",
-        "BERN ROOM (SHARING) 4": "Bern (sharing) 4",
-    }
-
-    # Track occupied ranges per room (including individual BERN children)
-    per_room: Dict[str, set] = {}
-
-    # Process each room row (rows 30-38, 0-indexed: 29-37)
-    for r_idx in range(29, 38):  # Rows 30-38 (0-indexed: 29-37)
-        if r_idx >= len(rows) or r_idx >= len(colors):
+        if not rng:
             continue
-            
-        room_row = rows[r_idx]
-        color_row = colors[r_idx]
-        
+        start, end = rng
+        all_sheet_start_dates.add(start)
+        if c >= 2:
+            valid_cols.append((c, start.strftime("%Y/%m/%d"), end.strftime("%Y/%m/%d")))
+    
+    if len(rows) < 38:  # Need at least 38 rows for room data
+        return [], all_sheet_start_dates
+
+    # Track occupied ranges per room (including individual BERN children), in column order
+    per_room: Dict[str, List[Tuple[str, str]]] = {}
+
+    # Process each room row (rows 30-38, 0-indexed: 29-37); zip stops early if colors are short
+    for room_row, color_row in zip(rows[29:38], colors[29:38]):
         # Get room name from first column
-        room_label = (room_row[0] or '').strip().upper()
-        if not room_label or "ROOM" not in room_label:
-            continue
-            
-        # Map to canonical room name
-        canonical = room_name_map.get(room_label)
-        if not canonical:
-            # Try partial match for BERN rooms
-            for k, v in room_name_map.items():
-                if room_label.startswith(k):
-                    canonical = v
-                    break
+        room_label = (room_row[0] or '').strip().upper() if room_row else ''
+        
+        # Map to canonical room name, falling back to a prefix match (e.g. BERN rooms with a suffix)
+        canonical = _ROOM_NAME_MAP.get(room_label)
+        if not canonical and room_label.startswith(_ROOM_PREFIXES):
+            canonical = next(v for k, v in _ROOM_NAME_MAP.items() if room_label.startswith(k))
         if not canonical:
             continue
             
         # Initialize bucket for this room
-        bucket = per_room.setdefault(canonical, set())
+        bucket = per_room.setdefault(canonical, [])
         
-        # Check each column for occupied dates
-        for c in range(2, min(len(room_row), len(color_row))):  # Start from column 3 (0-indexed: 2)
-            rng = col_to_range.get(c)
-            if not rng:
-                continue
-                
-            color = color_row[c] if c < len(color_row) else None
-            if color is None:
-                continue
-                
-            is_white_color = _is_white(color)
-            if not is_white_color:  # Non-white means occupied
-                start, end = rng
-                bucket.add((start.strftime("%Y/%m/%d"), end.strftime("%Y/%m/%d")))
+        # Occupied (non-white) dated columns in one comprehension over valid_cols
+        limit = min(len(room_row), len(color_row))
+        bucket.extend([(start_str, end_str) for c, start_str, end_str in valid_cols
+                       if c < limit and color_row[c] != WHITE])
+
+    # Dedupe while keeping column order; row 29 runs left to right chronologically,
+    # so this is already the date order sorted() used to produce
+    for room_name, bucket in per_room.items():
+        per_room[room_name] = list(dict.fromkeys(bucket))
 
     # Convert to results
     results: List[Dict] = []
-    for room_name, occupied_set in per_room.items():
+    for room_name, occupied in per_room.items():
         # Skip individual Bern sharing children from response; we'll add aggregated "Bern" below
         if room_name.upper().startswith("BERN (SHARING"):
             continue
-        occupied = sorted(list(occupied_set))
         results.append({
             "boat_name": boat_name,
             "room_name": room_name,
@@ -253,21 +243,17 @@ def _parse_open_trip_data(rows: List[List[str]], colors: List[List[Dict]], boat_
     # children are occupied.
     bern_children = [name for name in per_room.keys() if name.upper().startswith("BERN (SHARING)")]
     if bern_children:
-        # Count occupancy across children for each (start,end) range
-        range_to_count: Dict[Tuple[str, str], int] = {}
-        for child in bern_children:
-            for rng in per_room.get(child, set()):
-                range_to_count[rng] = range_to_count.get(rng, 0) + 1
         # A range is occupied for overall Bern only if ALL children are occupied in that range
-        all_children = len(bern_children)
-        bern_occupied = sorted([list(rng) for rng, cnt in range_to_count.items() if cnt >= all_children])
+        shared = set(per_room[bern_children[0]]).intersection(*(per_room[child] for child in bern_children[1:]))
+        # Walk the first child's list to keep date order
+        bern_occupied = [list(rng) for rng in per_room[bern_children[0]] if rng in shared]
         results.append({
             "boat_name": boat_name,
             "room_name": "Bern",
             "occupied": bern_occupied,
         })
 
-    return results
+    return results, all_sheet_start_dates
 
 
 def parse_open_trip_from_files(boat_name: str, worksheet_title: str = "OPEN TRIP") -> List[Dict]:
@@ -285,4 +271,5 @@ def parse_open_trip_from_files(boat_name: str, worksheet_title: str = "OPEN TRIP
     rows = _read_csv_rows(base_csv)
     colors = _read_colors(base_json)
     
-    return _parse_open_trip_data(rows, colors, boat_name)
\ No newline at end of file
+    rooms, _ = _parse_open_trip_data(rows, colors, boat_name)
+    return rooms
\ No newline at end of file
@@ -1,5 +1,11 @@
-from typing import List, Dict, Callable, Set
-from .client import get_gspread_client
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Callable, Set, Tuple
+from .client import get_gspread_client, get_sheets_service
+from .color_dump import fetch_values_and_colors
+from .sampler import extract_spreadsheet_id
 from .open_trip_parser import parse_open_trip_from_sheets
 from .sip1_parser import parse_sip1_from_sheets
 from .vmi_parser import parse_vinca_from_sheets, parse_raffles_from_sheets
@@ -11,74 +17,121 @@ from .sehat_parser import parse_sehat_from_sheets
 
 # Each parser returns a list of room dicts: {boat_name, boat_link?, room_name, room_link, occupied: [(start,end), ...]}
 
-Parser = Callable[[], List[Dict]]
+# (rows, colors) per boat from prefetch_all_boats(), passed to every parser of one full refresh
+Prefetched = Dict[str, Tuple[List[List[str]], list]]
 
-# Global storage for sheet start dates from parsers that provide them
-_lamain_sheet_start_dates: Set = set()
+Parser = Callable[[Prefetched | None], List[Dict]]
 
+# Progress messages go out at DEBUG, so they are dropped under the default WARNING level
+logger = logging.getLogger(__name__)
 
-def parser_boat_1() -> List[Dict]:
+# Sheet start dates from the last run of parsers that provide them, keyed by boat.
+# Parsers run on pool threads, so writes and reads go through the lock.
+_sheet_start_dates: Dict[str, Set] = {}
+_sheet_start_dates_lock = threading.Lock()
+
+# Boats whose parser reads one fixed worksheet: boat -> (worksheet title, A1 range or None for the whole sheet)
+_PREFETCH_WORKSHEETS: Dict[str, Tuple[str, str | None]] = {
+    "LaMain Voyages I": ("OPEN TRIP", None),
+    "SIP 1": ("OT SIP 1 ", None),
+    "KLM Arfisyana": ("ARFISYANA INDAH", "A1:Z1000"),
+    "VMI Vinca": ("PRIVATE VINCA 2025", None),
+    "VMI Raffles": ("PRIVATE RAFFLES 2025", None),
+}
+
+
+def prefetch_all_boats() -> Prefetched:
+    """Fetch the fixed worksheets of all boats with one values batchGet + one grid get per spreadsheet"""
+    from ..config import BOAT_CATALOG
+
+    # Group worksheets by spreadsheet so boats sharing a spreadsheet share its two calls
+    by_spreadsheet: Dict[str, List[Tuple[str, str, str | None]]] = {}
+    for boat_name, (title, a1) in _PREFETCH_WORKSHEETS.items():
+        sheet_link = (BOAT_CATALOG.get(boat_name) or {}).get("sheet_link")
+        if not sheet_link:
+            continue
+        try:
+            spreadsheet_id = extract_spreadsheet_id(sheet_link)
+        except ValueError:
+            continue
+        by_spreadsheet.setdefault(spreadsheet_id, []).append((boat_name, title, a1))
+
+    prefetched: Prefetched = {}
+    service = get_sheets_service()
+    for spreadsheet_id, entries in by_spreadsheet.items():
+        try:
+            fetched = fetch_values_and_colors(service, spreadsheet_id, [(title, a1) for _, title, a1 in entries])
+        except Exception as e:
+            # Boats left out fall back to fetching on their own
+            logger.warning("[PARSER] Prefetch failed for spreadsheet %s: %s", spreadsheet_id, e)
+            continue
+        for boat_name, title, _ in entries:
+            if title in fetched:
+                prefetched[boat_name] = fetched[title]
+    return prefetched
+
+
+def parser_boat_1(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "LaMain Voyages I"
-    global _lamain_sheet_start_dates
-    print(f"[PARSER] Starting parser for {boat_name}")
-    rooms, sheet_dates = parse_open_trip_from_sheets(boat_name)
-    print(f"[PARSER] Got {len(rooms)} rooms and {len(sheet_dates)} sheet dates")
-    _lamain_sheet_start_dates = sheet_dates
-    print(f"[PARSER] Stored {len(_lamain_sheet_start_dates)} sheet dates globally")
+    logger.debug("[PARSER] Starting parser for %s", boat_name)
+    rooms, sheet_dates = parse_open_trip_from_sheets(boat_name, prefetched=(prefetched or {}).get(boat_name))
+    logger.debug("[PARSER] Got %d rooms and %d sheet dates", len(rooms), len(sheet_dates))
+    with _sheet_start_dates_lock:
+        _sheet_start_dates[boat_name] = sheet_dates
     return rooms
 
 
-def parser_boat_2() -> List[Dict]:
+def parser_boat_2(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "SIP 1"
-    return parse_sip1_from_sheets(boat_name)
+    return parse_sip1_from_sheets(boat_name, prefetched=(prefetched or {}).get(boat_name))
 
 
-def parser_boat_3() -> List[Dict]:
+def parser_boat_3(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "KLM Arfisyana"
-    return parse_arfisyana_from_sheets(boat_name)
+    return parse_arfisyana_from_sheets(boat_name, prefetched=(prefetched or {}).get(boat_name))
 
 
-def parser_boat_4() -> List[Dict]:
+def parser_boat_4(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "VMI Vinca"
-    return parse_vinca_from_sheets(boat_name)
+    return parse_vinca_from_sheets(boat_name, prefetched=(prefetched or {}).get(boat_name))
 
 
-def parser_boat_5() -> List[Dict]:
+def parser_boat_5(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "VMI Raffles"
-    return parse_raffles_from_sheets(boat_name)
+    return parse_raffles_from_sheets(boat_name, prefetched=(prefetched or {}).get(boat_name))
 
 
-def parser_boat_6() -> List[Dict]:
+def parser_boat_6(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Barakati"
     return parse_barakati_from_sheets(boat_name)
 
 
-def parser_boat_7() -> List[Dict]:
+def parser_boat_7(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "El Rora"
     return parse_elrora_from_sheets(boat_name)
 
 
-def parser_boat_8() -> List[Dict]:
+def parser_boat_8(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Sehat Elona from Lombok"
     return parse_sehat_from_sheets(boat_name)
 
 
-def parser_boat_9() -> List[Dict]:
+def parser_boat_9(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Sehat Elona from Labuan Bajo"
     return parse_sehat_from_sheets(boat_name)
 
 
-def parser_boat_10() -> List[Dict]:
+def parser_boat_10(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Kanha Loka"
     return parse_kanha_from_sheets(boat_name)
 
 
-def parser_boat_11() -> List[Dict]:
+def parser_boat_11(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Kanha Natta"
     return parse_kanha_from_sheets(boat_name)
 
 
-def parser_boat_12() -> List[Dict]:
+def parser_boat_12(prefetched: Prefetched | None = None) -> List[Dict]:
     boat_name = "Kanha Citta"
     return parse_kanha_from_sheets(boat_name)
 
@@ -98,15 +151,30 @@ _PARSERS: List[Parser] = [
     parser_boat_12,
 ]
 
+# Shared pool for running the parsers concurrently; each one mostly waits on Sheets API calls.
+# Clients/services are memoized per thread (see client.py), so no Google client is shared across threads.
+_EXECUTOR = ThreadPoolExecutor(max_workers=len(_PARSERS), thread_name_prefix="parser")
+
 
 def get_all_rooms_with_occupied_ranges() -> List[Dict]:
     rooms: List[Dict] = []
-    for parser in _PARSERS:
-        rooms.extend(parser())
+    # Local to this refresh, so overlapping refreshes never see or clear each other's data
+    prefetched = prefetch_all_boats()
+    # map() keeps _PARSERS order, so the combined result is the same as a serial run
+    for parser_rooms in _EXECUTOR.map(lambda parser: parser(prefetched), _PARSERS):
+        rooms.extend(parser_rooms)
     return rooms
 
 
+# Per-boat parser results: boat -> (time.monotonic() when parsed, rooms)
+_CACHE: dict[str, tuple[float, List[Dict]]] = {}
+_TTL = 60.0
+_CACHE_LOCK = threading.Lock()
+
+
 def refresh_all():
+    with _CACHE_LOCK:
+        _CACHE.clear()
     return True
 
 
@@ -131,10 +199,20 @@ def get_rooms_with_occupied_ranges_for_boat(boat_name: str) -> List[Dict]:
     parser = _BOAT_TO_PARSER.get(boat_name)
     if not parser:
         return []
-    return parser()
+
+    # Repeat requests for the same boat within _TTL seconds reuse the last parse
+    with _CACHE_LOCK:
+        cached = _CACHE.get(boat_name)
+    if cached is not None and time.monotonic() - cached[0] < _TTL:
+        return list(cached[1])
+
+    rooms = parser(None)
+    with _CACHE_LOCK:
+        _CACHE[boat_name] = (time.monotonic(), rooms)
+    return list(rooms)
 
 
 def get_lamain_sheet_start_dates() -> Set:
     """Get the sheet start dates for Lamain Voyages I (cached from last parser call)"""
-    print(f"[PARSER] Retrieved {len(_lamain_sheet_start_dates)} sheet dates from global storage")
-    return _lamain_sheet_start_dates
+    with _sheet_start_dates_lock:
+        return set(_sheet_start_dates.get("LaMain Voyages I", ()))
@@ -1,23 +1,22 @@
 import os
-import re
 import csv
 from typing import List, Tuple
 import gspread
+from gspread.utils import absolute_range_name, fill_gaps
 
 from .client import get_gspread_client
 
-_SPREADSHEET_ID_RE = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
-
-
 def _ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
 def extract_spreadsheet_id(sheet_link: str) -> str:
-    m = _SPREADSHEET_ID_RE.search(sheet_link)
-    if not m:
+    # .../spreadsheets/d/<id>[/edit][?query][#fragment]
+    _, _, tail = sheet_link.partition("/spreadsheets/d/")
+    spreadsheet_id = tail.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    if not spreadsheet_id:
         raise ValueError("Invalid Google Sheets link")
-    return m.group(1)
+    return spreadsheet_id
 
 
 def _is_hidden(ws) -> bool:
@@ -32,16 +31,19 @@ def download_samples_for_spreadsheet(sheet_link: str, boat_name: str) -> List[st
     saved: List[str] = []
     dest_root = os.path.join("data", "samples", boat_name)
     _ensure_dir(dest_root)
-    for ws in sh.worksheets():
-        if _is_hidden(ws):
-            continue
-        title = ws.title
-        rows = ws.get_all_values()
+    titles = [ws.title for ws in sh.worksheets() if not _is_hidden(ws)]
+    if not titles:
+        return saved
+    # One values.batchGet for every visible worksheet instead of a get_all_values() call each
+    value_ranges = sh.values_batch_get([absolute_range_name(title) for title in titles]).get("valueRanges", [])
+    for title, value_range in zip(titles, value_ranges):
+        # Pad like get_all_values() so every row has the same width
+        rows = fill_gaps(value_range.get("values", []) or [])
         dest_path = os.path.join(dest_root, f"{title}.csv")
-        with open(dest_path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            for r in rows:
-                writer.writerow(r)
+        # Cells can hold commas, quotes and newlines, so keep the csv writer but hand it every
+        # row at once through a 1 MiB buffer
+        with open(dest_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+            csv.writer(f).writerows(rows)
         saved.append(dest_path)
     return saved
 
@@ -50,22 +52,20 @@ def download_samples_for_spreadsheet(sheet_link: str, boat_name: str) -> List[st
 def analyze_kanha_xlsx(xlsx_path: str) -> dict:
     from openpyxl import load_workbook
 
-    wb = load_workbook(filename=xlsx_path, data_only=True)
-    ws = wb.active
-
-    # convert to 0-based list of list strings
-    rows: List[List[str]] = []
-    for row in ws.iter_rows(values_only=True):
-        rows.append([(str(c) if c is not None else "") for c in row])
-
-    # find row with CABIN and ROOM in first two cells
-    bands_row_idx = None
-    for i, r in enumerate(rows):
-        c0 = (r[0] if len(r) > 0 else '').strip().upper()
-        c1 = (r[1] if len(r) > 1 else '').strip().upper()
-        if c0.startswith('CABIN') and c1 == 'ROOM':
-            bands_row_idx = i
-            break
+    # First pass streams values only (read_only skips loading styles) to find the bands row
+    wb = load_workbook(filename=xlsx_path, data_only=True, read_only=True)
+    try:
+        # find row with CABIN and ROOM in first two cells
+        bands_row_idx = None
+        # Only the first two columns are read; nothing else of the sheet is materialized
+        for i, row in enumerate(wb.active.iter_rows(max_col=2, values_only=True)):
+            c0 = str(row[0] if len(row) > 0 and row[0] is not None else '').strip().upper()
+            c1 = str(row[1] if len(row) > 1 and row[1] is not None else '').strip().upper()
+            if c0.startswith('CABIN') and c1 == 'ROOM':
+                bands_row_idx = i
+                break
+    finally:
+        wb.close()
 
     result = {
         "bands_row_idx": bands_row_idx,
@@ -76,6 +76,10 @@ def analyze_kanha_xlsx(xlsx_path: str) -> dict:
     if bands_row_idx is None:
         return result
 
+    # Border styles need the full workbook; only opened once the bands row is known
+    wb = load_workbook(filename=xlsx_path, data_only=True)
+    ws = wb.active
+
     # detect bands using border thickness on that row
     def is_bold(cell) -> bool:
         b = getattr(cell, 'border', None)
@@ -1,10 +1,33 @@
 import os
 import json
+import re
+from functools import lru_cache
+from itertools import islice
 from typing import List, Dict, Optional, Tuple
 from datetime import date, datetime
 
-from .client import get_gspread_client, get_sheets_service
-from .color_dump import get_worksheet_colors
+from gspread.utils import absolute_range_name
+
+from .cache import cached_fetch, get_modified_time
+from .client import get_sheets_service
+from .color_dump import WHITE, colors_from_json, fetch_worksheet_grid
+from .sampler import extract_spreadsheet_id
+
+
+# Only the header and room rows (rows 10-23) are read
+_COLOR_ROWS = 30
+
+
+def _fetch_values_and_colors(sheet_link: str, worksheet_title: str) -> Tuple[List[List[str]], list]:
+    """Values and colors of the top of the worksheet from one API call, reused from disk while unmodified"""
+    spreadsheet_id = extract_spreadsheet_id(sheet_link)
+    rng = absolute_range_name(worksheet_title, f"1:{_COLOR_ROWS}")
+
+    def _fetch():
+        return fetch_worksheet_grid(get_sheets_service(), spreadsheet_id, rng)
+
+    # Rooms and sheet start dates read the same worksheet; the second caller hits the cache
+    return cached_fetch(spreadsheet_id, "sip1", worksheet_title, get_modified_time(spreadsheet_id), _fetch)
 
 
 def _read_csv_rows(csv_path: str) -> List[List[str]]:
@@ -21,63 +44,94 @@ def _read_csv_rows(csv_path: str) -> List[List[str]]:
     return rows
 
 
-def _read_colors(json_path: str) -> List[List[Dict]]:
-    """Read colors JSON file"""
+def _read_colors(json_path: str) -> List[List[int]]:
+    """Read colors JSON file as packed 0xRRGGBB rows"""
     if not os.path.exists(json_path):
         return []
     
     with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        return colors_from_json(json.load(f))
+
 
+# "<day>-<day>", e.g. "4-6" or "30-1"
+_RANGE_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
 
+
+@lru_cache(maxsize=512)
 def _parse_date_range_cell(cell_value: str, month: int) -> Optional[Tuple[date, date]]:
-    """Parse date range from cell value like '4-6', '7-9', etc."""
-    if not cell_value or not cell_value.strip():
+    """Parse date range from cell value like '4-6', '7-9', etc.
+
+    Cached: sheets repeat the same range strings and the result is immutable.
+    """
+    if not cell_value:
         return None
+    m = _RANGE_RE.match(cell_value)
+    if not m:
+        return None
+    start_day = int(m.group(1))
+    end_day = int(m.group(2))
     
-    # Clean the cell value
-    cell_value = cell_value.strip()
+    year = 2025
     
-    # Handle different formats
-    if '-' in cell_value:
-        parts = cell_value.split('-')
-        if len(parts) == 2:
-            try:
-                start_day = int(parts[0].strip())
-                end_day = int(parts[1].strip())
-                
-                year = 2025
-                
-                # Handle month overflow (e.g., "30-1" means 30th to 1st of next month)
-                if end_day < start_day:
-                    # Cross-month range
-                    start_date = date(year, month, start_day)
-                    if month == 12:
-                        end_date = date(year + 1, 1, end_day)
-                    else:
-                        end_date = date(year, month + 1, end_day)
-                else:
-                    # Same month range
-                    start_date = date(year, month, start_day)
-                    end_date = date(year, month, end_day)
-                
-                return (start_date, end_date)
-            except (ValueError, TypeError):
-                return None
+    try:
+        # Handle month overflow (e.g., "30-1" means 30th to 1st of next month)
+        if end_day < start_day:
+            # Cross-month range
+            start_date = date(year, month, start_day)
+            if month == 12:
+                end_date = date(year + 1, 1, end_day)
+            else:
+                end_date = date(year, month + 1, end_day)
+        else:
+            # Same month range
+            start_date = date(year, month, start_day)
+            end_date = date(year, month, end_day)
+    except ValueError:
+        # Day out of range for its month
+        return None
     
-    return None
+    return (start_date, end_date)
 
 
-def _is_white(color: Optional[Dict]) -> bool:
-    """Check if color is white (available)"""
-    if color is None:
-        return True  # No color means white/available
-    r = color.get('r'); g = color.get('g'); b = color.get('b')
-    return (r is None and g is None and b is None) or (r == 1 and g == 1 and b == 1)
+# Month header labels of row 10
+_MONTH_MAP = {
+    "APRIL": 4, "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
+    "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12
+}
 
 
-def parse_sip1_from_sheets(boat_name: str, worksheet_title: str = "OT SIP 1 ") -> List[Dict]:
-    """Parse SIP 1 data directly from Google Sheets"""
+def _build_col_to_range(month_header_row: List[str], date_range_row: List[str]) -> List[Optional[Tuple[date, date]]]:
+    """Date range of each column of row 11, using the month header in effect above it (row 10)"""
+    col_to_range: List[Optional[Tuple[date, date]]] = []
+    current_month = None
+    for c, cell_value in enumerate(date_range_row):
+        if c < len(month_header_row):
+            current_month = _MONTH_MAP.get(month_header_row[c].strip().upper(), current_month)
+        else:
+            # Past the header row no month is in effect
+            current_month = None
+        # Default to September if no month found
+        col_to_range.append(_parse_date_range_cell(cell_value, current_month or 9))
+    return col_to_range
+
+
+# Fixed room layout of the SIP 1 sheet: (first bed row 0-indexed, bed count, room name from the config).
+# Each room is a run of bed rows starting at row 12 (0-indexed: 11).
+_ROOM_BEDS = (
+    (11, 2, "Master Ocean 1"),     # Row 12-13 (2 beds)
+    (13, 2, "Private Cabin 2"),    # Row 14-15 (2 beds)
+    (15, 2, "Private Cabin 3"),    # Row 16-17 (2 beds)
+    (17, 2, "Private Cabin 4"),    # Row 18-19 (2 beds)
+    (19, 4, "Sharing Cabin 5"),    # Row 20-23 (4 beds)
+)
+
+
+def parse_sip1_from_sheets(boat_name: str, worksheet_title: str = "OT SIP 1 ",
+                           prefetched: Optional[Tuple[List[List[str]], list]] = None) -> List[Dict]:
+    """Parse SIP 1 data directly from Google Sheets
+
+    Pass `prefetched` (rows, colors) from a batched fetch to skip the per-boat API calls.
+    """
     from ..config import BOAT_CATALOG
     
     if boat_name not in BOAT_CATALOG:
@@ -88,17 +142,10 @@ def parse_sip1_from_sheets(boat_name: str, worksheet_title: str = "OT SIP 1 ") -
         return []
     
     try:
-        # Get gspread client and open the sheet
-        gc = get_gspread_client()
-        sheet = gc.open_by_url(sheet_link)
-        worksheet = sheet.worksheet(worksheet_title)
-        
-        # Get all values from the worksheet
-        rows = worksheet.get_all_values()
-        
-        # Get colors using the sheets service
-        sheets_service = get_sheets_service()
-        colors = get_worksheet_colors(sheets_service, sheet.id, worksheet_title)
+        if prefetched is not None:
+            rows, colors = prefetched
+        else:
+            rows, colors = _fetch_values_and_colors(sheet_link, worksheet_title)
         
         return _parse_sip1_data(rows, colors, boat_name)
         
@@ -107,7 +154,7 @@ def parse_sip1_from_sheets(boat_name: str, worksheet_title: str = "OT SIP 1 ") -
         return []
 
 
-def _parse_sip1_data(rows: List[List[str]], colors: List[List[Dict]], boat_name: str) -> List[Dict]:
+def _parse_sip1_data(rows: List[List[str]], colors: List[List[int]], boat_name: str) -> List[Dict]:
     """Parse SIP 1 data from rows and colors arrays"""
     # The month headers are in row 10 (0-indexed: 9)
     # The date ranges are in row 11 (0-indexed: 10)
@@ -119,123 +166,49 @@ def _parse_sip1_data(rows: List[List[str]], colors: List[List[Dict]], boat_name:
     month_header_row = rows[9]   # Row 10: Month headers
     date_range_row = rows[10]    # Row 11: Date ranges
     
-    # Parse month headers and map to month numbers
-    month_map = {
-        "APRIL": 4, "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
-        "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12
-    }
-    
-    # Find month boundaries in the header row
-    col_to_month: Dict[int, int] = {}
-    current_month = None
-    
-    for c, cell_value in enumerate(month_header_row):
-        cell_upper = cell_value.strip().upper()
-        if cell_upper in month_map:
-            current_month = month_map[cell_upper]
-        if current_month:
-            col_to_month[c] = current_month
-    
-    # Parse date ranges from row 11 with month context
-    col_to_range: Dict[int, Optional[Tuple[date, date]]] = {}
-    
-    for c, cell_value in enumerate(date_range_row):
-        month = col_to_month.get(c, 9)  # Default to September if no month found
-        rng = _parse_date_range_cell(cell_value, month)
-        col_to_range[c] = rng
-
-    # Room name mapping based on the config
-    room_name_map = {
-        "MASTER OCEAN 1": "Master Ocean 1",
-        "PRIVATE CABIN 2": "Private Cabin 2", 
-        "PRIVATE CABIN 3": "Private Cabin 3",
-        "PRIVATE CABIN 4": "Private Cabin 4",
-        "SHARING CABIN": "Sharing Cabin 5",
-    }
-
-    # Track occupied ranges per room
-    per_room: Dict[str, set] = {}
-
-    # Process room rows (rows 12-22, 0-indexed: 11-21)
-    # Each room has multiple beds, so we need to aggregate by room
-    room_bed_mapping = [
-        (11, 2, "MASTER OCEAN 1"),      # Row 12-13 (2 beds)
-        (13, 2, "PRIVATE CABIN 2"),     # Row 14-15 (2 beds)
-        (15, 2, "PRIVATE CABIN 3"),     # Row 16-17 (2 beds)
-        (17, 2, "PRIVATE CABIN 4"),     # Row 18-19 (2 beds)
-        (19, 4, "SHARING CABIN"),       # Row 20-23 (4 beds)
-    ]
-    
-    for start_row, num_beds, room_label in room_bed_mapping:
+    # Date range per column, indexed by column number
+    col_to_range = _build_col_to_range(month_header_row, date_range_row)
+    # Output strings formatted once per column rather than once per (bed, column)
+    col_to_range_str = [(rng[0].strftime("%Y/%m/%d"), rng[1].strftime("%Y/%m/%d")) if rng else None
+                        for rng in col_to_range]
+
+    results: List[Dict] = []
+    for start_row, num_beds, room_name in _ROOM_BEDS:
         if start_row >= len(rows) or start_row >= len(colors):
             continue
-            
-        # Map to canonical room name
-        canonical = room_name_map.get(room_label)
-        if not canonical:
-            continue
-            
-        # Initialize bucket for this room
-        bucket = per_room.setdefault(canonical, set())
         
-        # Check all beds for this room
         # Track occupied dates per bed, then aggregate at room level
         bed_occupied_ranges = []
         
-        for bed_idx in range(num_beds):
-            r_idx = start_row + bed_idx
-            if r_idx >= len(rows) or r_idx >= len(colors):
-                continue
-                
+        for r_idx in range(start_row, min(start_row + num_beds, len(rows), len(colors))):
             room_row = rows[r_idx]
             color_row = colors[r_idx]
             
-            # Track occupied dates for this bed
-            bed_occupied = set()
-            
-            # Check each column for occupied dates (starting from column 3, 0-indexed: 2)
-            for c in range(2, min(len(room_row), len(color_row))):
-                rng = col_to_range.get(c)
-                if not rng:
-                    continue
-                    
-                color = color_row[c] if c < len(color_row) else None
-                if color is None:
-                    continue
-                    
-                is_white_color = _is_white(color)
-                if not is_white_color:  # Non-white means occupied
-                    start, end = rng
-                    bed_occupied.add((start.strftime("%Y/%m/%d"), end.strftime("%Y/%m/%d")))
+            # Occupied dates for this bed: each column from column 3 (0-indexed: 2) walked
+            # once, ranges and colors paired by zip; zip stops at the shorter of the two
+            end_c = len(room_row)
+            # A plain int compare per cell; non-white means occupied
+            bed_occupied = {rng for rng, color in zip(islice(col_to_range_str, 2, end_c), islice(color_row, 2, end_c))
+                            if rng and color != WHITE}
             
             bed_occupied_ranges.append(bed_occupied)
         
         # Aggregate at room level: room is occupied only if ALL beds are occupied for that date range
         # This means a room is available if ANY bed is available
+        all_occupied = set()
         if bed_occupied_ranges:
-            # Start with all possible occupied ranges from all beds
-            all_occupied = set()
-            for bed_occupied in bed_occupied_ranges:
-                all_occupied.update(bed_occupied)
-            
-            # Remove ranges where at least one bed is available
-            for bed_occupied in bed_occupied_ranges:
-                for occupied_range in all_occupied.copy():
-                    if occupied_range not in bed_occupied:
-                        # This bed is available for this range, so room is available
-                        all_occupied.discard(occupied_range)
-            
-            # Add the remaining ranges (where all beds are occupied)
-            bucket.update(all_occupied)
-
-    # Convert to results
-    results: List[Dict] = []
-    for room_name, occupied_set in per_room.items():
-        occupied = sorted(list(occupied_set))
+            # Intersect smallest first so the working set shrinks fastest; stop once a range is free on every bed
+            beds_sorted = sorted(bed_occupied_ranges, key=len)
+            all_occupied = set(beds_sorted[0])
+            for bed_occupied in beds_sorted[1:]:
+                if not all_occupied:
+                    break
+                all_occupied &= bed_occupied
+        
         results.append({
             "boat_name": boat_name,
             "room_name": room_name,
-            "occupied": occupied,
+            "occupied": sorted(all_occupied),
         })
 
     return results
@@ -263,13 +236,7 @@ def get_sip1_all_sheet_start_dates(boat_name: str, worksheet_title: str = "OT SI
         return set()
     
     try:
-        # Get gspread client and open the sheet
-        gc = get_gspread_client()
-        sheet = gc.open_by_url(sheet_link)
-        worksheet = sheet.worksheet(worksheet_title)
-        
-        # Get all values from the worksheet
-        rows = worksheet.get_all_values()
+        rows, _ = _fetch_values_and_colors(sheet_link, worksheet_title)
         
         # Parse month headers and date ranges to get all start dates
         if len(rows) < 12:
@@ -278,32 +245,9 @@ def get_sip1_all_sheet_start_dates(boat_name: str, worksheet_title: str = "OT SI
         month_header_row = rows[9]   # Row 10: Month headers
         date_range_row = rows[10]    # Row 11: Date ranges
         
-        # Parse month headers and map to month numbers
-        month_map = {
-            "APRIL": 4, "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
-            "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12
-        }
-        
-        # Find month boundaries in the header row
-        col_to_month = {}
-        current_month = None
-        
-        for c, cell_value in enumerate(month_header_row):
-            cell_upper = cell_value.strip().upper()
-            if cell_upper in month_map:
-                current_month = month_map[cell_upper]
-            if current_month:
-                col_to_month[c] = current_month
-        
-        # Parse date ranges from row 11 with month context
-        all_sheet_start_dates = set()
-        
-        for c, cell_value in enumerate(date_range_row):
-            month = col_to_month.get(c, 9)  # Default to September if no month found
-            rng = _parse_date_range_cell(cell_value, month)
-            if rng:
-                start_date, end_date = rng
-                all_sheet_start_dates.add(start_date)
+        # Every parsed range starts a trip, whether or not it is booked
+        col_to_range = _build_col_to_range(month_header_row, date_range_row)
+        all_sheet_start_dates = {rng[0] for rng in col_to_range if rng}
         
         return all_sheet_start_dates
         
@@ -1,31 +1,91 @@
+import re
+from collections import namedtuple
 from datetime import date
-from typing import List, Dict, Set
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple
+
+from gspread.utils import absolute_range_name
 
 from .client import get_gspread_client, get_sheets_service
-from .color_dump import get_worksheet_colors
+from .color_dump import WHITE, fetch_worksheet_grid
+from .sampler import extract_spreadsheet_id
+
+
+MONTH_MAP = {
+    # English
+    "JANUARY": 1, "FEBRUARY": 2, "MARCH": 3, "APRIL": 4,
+    "MAY": 5, "JUNE": 6, "JULY": 7, "AUGUST": 8,
+    "SEPTEMBER": 9, "OCTOBER": 10, "NOVEMBER": 11, "DECEMBER": 12,
+    # Indonesian variants commonly seen in sheets
+    "JANUARI": 1, "FEBRUARI": 2, "MARET": 3, "APRIL": 4,
+    "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
+    "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12,
+}
+
+# Any month name anywhere in a cell; one scan rejects the cells that mention none
+_MONTH_RE = re.compile("|".join(MONTH_MAP))
+
+
+# A month block of the calendar: its columns [start_col, end_col) and the header row
+MonthSection = namedtuple("MonthSection", "month start_col end_col header_row")
+
+
+def _find_month_sections(rows: List[List[str]]) -> List[MonthSection]:
+    """Month headers of the calendar: one section per month name found in a cell"""
+    month_sections = []
+    for i, row in enumerate(rows):
+        # One regex scan per row: cells are joined on a newline, which no month name contains,
+        # so a hit here means some single cell mentions a month
+        if not _MONTH_RE.search("\n".join(filter(None, row)).upper()):
+            continue
+        # Look for month names in this row
+        for j, cell in enumerate(row):
+            cell_upper = (cell or "").strip().upper()
+            if not _MONTH_RE.search(cell_upper):
+                continue
+            # Substring match per name, as a cell may mention more than one month
+            for month_name, month_num in MONTH_MAP.items():
+                if month_name in cell_upper:
+                    # Found a month header at position (i, j); the section starts one column left of it
+                    month_start_col = j - 1
+                    month_sections.append(MonthSection(month_num, month_start_col, month_start_col + 6, i))
+    return month_sections
+
+
+# Day-number cell texts ("1".."31", zero-padded "01".."09"): one hash lookup instead of isdigit() + int()
+_DAY_MAP = {**{str(d): d for d in range(1, 32)}, **{f"{d:02d}": d for d in range(1, 10)}}
 
 
-def _parse_calendar_date(day_str: str, month: int, year: int = 2025) -> date | None:
-    """Parse a day string into a date object"""
+# Day code of other 1-2 digit text ("0", "45", "٣"): still marks a row as a date row
+_NOT_A_DAY = 255
+
+
+def _odd_day_code(text: str) -> int:
+    """Day code of digit text missing from _DAY_MAP: its day if int() reads one, else _NOT_A_DAY"""
+    if len(text) > 2:
+        return 0
     try:
-        day = int(day_str.strip())
-        return date(year, month, day)
-    except Exception:
-        return None
+        day = int(text)
+    except ValueError:
+        return _NOT_A_DAY
+    return day if 1 <= day <= 31 else _NOT_A_DAY
+
+
+def _day_code(text: str) -> int:
+    """1-31 for a day-number cell, _NOT_A_DAY for other 1-2 digit text, 0 otherwise"""
+    return _DAY_MAP.get(text, 0) or (text.isdigit() and _odd_day_code(text))
 
 
-def _is_white(color: dict) -> bool:
-    """Check if a color is pure white (available)"""
-    if not color:
-        return False
-    r = color.get("r", 0)
-    g = color.get("g", 0)
-    b = color.get("b", 0)
-    # Treat only pure white as available
-    return r == 1 and g == 1 and b == 1
+@lru_cache(maxsize=1024)
+def _calendar_date(year: int, month: int, day: int) -> date | None:
+    """date(year, month, day), or None when the day doesn't exist in that month"""
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
 
 
-def _parse_calendar(rows: List[List[str]], colors: List[List[dict]], boat_name: str) -> List[Dict]:
+def _parse_calendar(rows: List[List[str]], colors: List[List[int]], boat_name: str) -> List[Dict]:
     """
     Parse calendar-style layout for VMI boats using proper month section detection.
     
@@ -37,47 +97,18 @@ def _parse_calendar(rows: List[List[str]], colors: List[List[dict]], boat_name:
     results: List[Dict] = []
     available_dates: List[date] = []
 
-    month_map = {
-        # English
-        "JANUARY": 1, "FEBRUARY": 2, "MARCH": 3, "APRIL": 4,
-        "MAY": 5, "JUNE": 6, "JULY": 7, "AUGUST": 8,
-        "SEPTEMBER": 9, "OCTOBER": 10, "NOVEMBER": 11, "DECEMBER": 12,
-        # Indonesian variants commonly seen in sheets
-        "JANUARI": 1, "FEBRUARI": 2, "MARET": 3, "APRIL": 4,
-        "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
-        "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12,
-    }
-    
     current_year = 2025
 
     # Step 1: Find all month sections
-    month_sections = []
-    for i, row in enumerate(rows):
-        # Look for month names in this row
-        for j, cell in enumerate(row):
-            cell_upper = (cell or "").strip().upper()
-            for month_name, month_num in month_map.items():
-                if month_name in cell_upper:
-                    # Found a month header at position (i, j)
-                    # Now determine the column range for this month section
-                    month_start_col = j - 1
-                    month_end_col = month_start_col + 6
-                    
-                    month_sections.append({
-                        'month': month_num,
-                        'month_name': month_name,
-                        'start_col': month_start_col,
-                        'end_col': month_end_col,
-                        'header_row': i
-                    })
-    
+    month_sections = _find_month_sections(rows)
+
+    # Day code (see _day_code) per cell, built once per row: the stdlib stand-in for a vectorized
+    # cell scan. Built lazily, so only rows inside some month section are scanned, and sections
+    # that overlap rows reuse them instead of stripping each cell again.
+    day_masks: Dict[int, bytes] = {}
+
     # Step 2: Parse date cells within each month section
-    for section in month_sections:
-        month_num = section['month']
-        start_col = section['start_col']
-        end_col = section['end_col']
-        header_row = section['header_row']
-        
+    for month_num, start_col, end_col, header_row in month_sections:
         # Define the row boundaries for this month section
         # Each month section has a specific number of rows (typically 6-7 rows)
         # Start from header_row + 2 (skip header and weekday rows)
@@ -87,29 +118,28 @@ def _parse_calendar(rows: List[List[str]], colors: List[List[dict]], boat_name:
         
         # Parse date cells within the month section's row boundaries
         for i in range(start_row, min(end_row, len(rows))):
-            if i >= len(rows):
-                break
-                
-            row = rows[i]
+            mask = day_masks.get(i)
+            if mask is None:
+                mask = day_masks[i] = bytes([_day_code((cell or "").strip()) for cell in rows[i]])
             
-            # Check if this row contains date numbers within the month's column range
-            has_dates = any((cell or "").strip().isdigit() and len((cell or "").strip()) <= 2 
-                           for cell in row[start_col:end_col])
+            # Check if this row contains date numbers within the month's column range;
+            # a row without colors can't mark any date available either
+            if not any(mask[start_col:end_col]) or i >= len(colors):
+                continue
             
-            if has_dates:
-                # Parse date cells within this month's column range
-                for j in range(start_col, min(end_col, len(row))):
-                    cell_text = (row[j] or "").strip()
-                    if cell_text.isdigit() and len(cell_text) <= 2:
-                        parsed = _parse_calendar_date(cell_text, month_num, current_year)
-                        if not parsed:
-                            continue
-                        # Only process dates that are actually in the target year (2025)
-                        if parsed.year == current_year:
-                            if i < len(colors) and j < len(colors[i]):
-                                color = colors[i][j]
-                                if _is_white(color):
-                                    available_dates.append(parsed)
+            color_row = colors[i]
+            color_cols = len(color_row)
+            # Parse date cells within this month's column range
+            for j in range(start_col, min(end_col, len(mask))):
+                day = mask[j]
+                if not day:
+                    continue
+                parsed = _calendar_date(current_year, month_num, day)
+                if not parsed:
+                    continue
+                # Only process dates that are actually in the target year (2025)
+                if parsed.year == current_year and j < color_cols and color_row[j] == WHITE:
+                    available_dates.append(parsed)
 
     if available_dates:
         results.append({
@@ -123,8 +153,12 @@ def _parse_calendar(rows: List[List[str]], colors: List[List[dict]], boat_name:
     return results
 
 
-def _parse_from_sheet(boat_name: str, worksheet_title: str) -> List[Dict]:
-    """Parse a specific worksheet for a boat"""
+def _parse_from_sheet(boat_name: str, worksheet_title: str, prefetched: Tuple[List[List[str]], list] | None = None) -> List[Dict]:
+    """Parse a specific worksheet for a boat, or its prefetched (rows, colors)"""
+    if prefetched is not None:
+        rows, colors = prefetched
+        return _parse_calendar(rows, colors, boat_name)
+
     from ..config import BOAT_CATALOG
     if boat_name not in BOAT_CATALOG:
         return []
@@ -132,24 +166,22 @@ def _parse_from_sheet(boat_name: str, worksheet_title: str) -> List[Dict]:
     if not sheet_link:
         return []
 
-    gc = get_gspread_client()
-    sh = gc.open_by_url(sheet_link)
-    ws = sh.worksheet(worksheet_title)
-    rows = ws.get_all_values()
-
-    sheets_service = get_sheets_service()
-    colors = get_worksheet_colors(sheets_service, sh.id, worksheet_title)
+    # Values and colors of the whole worksheet in one round-trip
+    rows, colors = fetch_worksheet_grid(get_sheets_service(), extract_spreadsheet_id(sheet_link),
+                                        absolute_range_name(worksheet_title))
     return _parse_calendar(rows, colors, boat_name)
 
 
-def parse_vinca_from_sheets(boat_name: str, worksheet_title: str = "PRIVATE VINCA 2025") -> List[Dict]:
+def parse_vinca_from_sheets(boat_name: str, worksheet_title: str = "PRIVATE VINCA 2025",
+                            prefetched: Tuple[List[List[str]], list] | None = None) -> List[Dict]:
     """Parse VMI Vinca boat data"""
-    return _parse_from_sheet(boat_name, worksheet_title)
+    return _parse_from_sheet(boat_name, worksheet_title, prefetched)
 
 
-def parse_raffles_from_sheets(boat_name: str, worksheet_title: str = "PRIVATE RAFFLES 2025") -> List[Dict]:
+def parse_raffles_from_sheets(boat_name: str, worksheet_title: str = "PRIVATE RAFFLES 2025",
+                              prefetched: Tuple[List[List[str]], list] | None = None) -> List[Dict]:
     """Parse VMI Raffles boat data"""
-    return _parse_from_sheet(boat_name, worksheet_title)
+    return _parse_from_sheet(boat_name, worksheet_title, prefetched)
 
 
 def get_vmi_all_sheet_start_dates(boat_name: str, worksheet_title: str) -> Set[date]:
@@ -167,49 +199,20 @@ def get_vmi_all_sheet_start_dates(boat_name: str, worksheet_title: str) -> Set[d
     ws = sh.worksheet(worksheet_title)
     rows = ws.get_all_values()
 
-    month_map = {
-        # English
-        "JANUARY": 1, "FEBRUARY": 2, "MARCH": 3, "APRIL": 4,
-        "MAY": 5, "JUNE": 6, "JULY": 7, "AUGUST": 8,
-        "SEPTEMBER": 9, "OCTOBER": 10, "NOVEMBER": 11, "DECEMBER": 12,
-        # Indonesian variants
-        "JANUARI": 1, "FEBRUARI": 2, "MARET": 3, "APRIL": 4,
-        "MEI": 5, "JUNI": 6, "JULI": 7, "AGUSTUS": 8,
-        "SEPTEMBER": 9, "OKTOBER": 10, "NOVEMBER": 11, "DESEMBER": 12,
-    }
-    
     current_year = 2025
     
     # Use the same month section detection logic as the main parser
-    month_sections = []
-    for i, row in enumerate(rows):
-        for j, cell in enumerate(row):
-            cell_upper = (cell or "").strip().upper()
-            for month_name, month_num in month_map.items():
-                if month_name in cell_upper:
-                    month_start_col = j - 1
-                    month_end_col = month_start_col + 6
-                    
-                    month_sections.append({
-                        'month': month_num,
-                        'start_col': month_start_col,
-                        'end_col': month_end_col,
-                        'header_row': i
-                    })
+    month_sections = _find_month_sections(rows)
     
     # Extract all date numbers from each month section
-    for section in month_sections:
-        month_num = section['month']
-        start_col = section['start_col']
-        end_col = section['end_col']
-        header_row = section['header_row']
+    for month_num, start_col, end_col, header_row in month_sections:
         
         for i in range(header_row + 2, len(rows)):
             row = rows[i]
             for j in range(start_col, min(end_col, len(row))):
-                cell_text = (row[j] or "").strip()
-                if cell_text.isdigit() and len(cell_text) <= 2:
-                    parsed = _parse_calendar_date(cell_text, month_num, current_year)
+                day = _day_code((row[j] or "").strip())
+                if day:
+                    parsed = _calendar_date(current_year, month_num, day)
                     if parsed and parsed.year == current_year:
                         dates.add(parsed)
     